@@ -1,16 +1,15 @@
 import os
+import hashlib
 from enum import IntEnum
-from time import sleep
 from dataclasses import dataclass
 from typing import Tuple, Callable, Union, List, Iterable
-from threading import Thread
 
 import tkinter as tk
 import tkinter.scrolledtext as tks
 import numpy as np
 
 from map_editor.map_file_parser import \
-    parse_mapfile_text, VisualizableMapConfig
+    parse_mapfile_text, VisualizableMapConfig, GlobalRoute
 
 Vec2D = Tuple[float, float]
 Range2D = Tuple[float, float] # (low, high)
@@ -28,9 +27,12 @@ class MapCanvas:
     ROBOT_ROUTE_COLOR = "green"
     PED_CROWDED_COLOR = "orange"
     PED_ROUTE_COLOR = "yellow"
+    TEMP_ITEMS_TAG = "temp"
 
     def __init__(self, frame: tk.Frame):
         self.canvas = tk.Canvas(frame)
+        self.line_items: List[int] = []
+        self.oval_items: List[int] = []
         self.width, self.height = 800, 800
         self.canvas.config(width=self.width, height=self.height)
         self.mouse_pos = (0, 0)
@@ -64,67 +66,85 @@ class MapCanvas:
 
     def render(self, map_config: VisualizableMapConfig):
         self.last_map_bounds = (map_config.x_margin, map_config.y_margin)
-        self.canvas.delete("all")
+        self.canvas.delete(MapCanvas.TEMP_ITEMS_TAG)
         self.canvas.configure(bg=MapCanvas.BG_COLOR)
         scaling = self.map_to_canvas_scaling()
-
-        def rect_points(rect: Rect) -> List[Vec2D]:
-            add_vec = lambda v1, v2: (v1[0] + v2[0], v1[1] + v2[1])
-            sub_vec = lambda v1, v2: (v1[0] - v2[0], v1[1] - v2[1])
-            p1, p2, p3 = rect
-            p4 = add_vec(sub_vec(p3, p2), p1)
-            return [p1, p2, p3, p4]
-
-        def scale(p: Vec2D) -> Vec2D:
-            (min_x, _), (min_y, _) = map_config.x_margin, map_config.y_margin
-            return (p[0] - min_x) * scaling, (p[1] - min_y) * scaling
-
-        def draw_zone(zone_id: int, rect: List[Vec2D], color="black"):
-            p1, p2, p3, p4 = rect
-            self.canvas.create_line(scale(p1), scale(p2), fill=color)
-            self.canvas.create_line(scale(p2), scale(p3), fill=color)
-            self.canvas.create_line(scale(p3), scale(p4), fill=color)
-            self.canvas.create_line(scale(p4), scale(p1), fill=color)
-
-            min_x, max_x = min(p1[0], p2[0], p3[0], p4[0]), max(p1[0], p2[0], p3[0], p4[0])
-            min_y, max_y = min(p1[1], p2[1], p3[1], p4[1]), max(p1[1], p2[1], p3[1], p4[1])
-            middle = min_x + (max_x - min_x) / 2, min_y + (max_y - min_y) / 2
-            middle = scale(middle)
+        offset = np.array([map_config.x_margin[0], map_config.y_margin[0]], dtype=np.float64)
+
+        def scale(points: np.ndarray) -> np.ndarray:
+            return (points - offset) * scaling
+
+        zones = [(map_config.robot_spawn_zones, MapCanvas.ROBOT_SPAWN_COLOR),
+                 (map_config.robot_goal_zones, MapCanvas.ROBOT_GOAL_COLOR),
+                 (map_config.ped_spawn_zones, MapCanvas.PED_SPAWN_COLOR),
+                 (map_config.ped_goal_zones, MapCanvas.PED_GOAL_COLOR),
+                 (map_config.ped_crowded_zones, MapCanvas.PED_CROWDED_COLOR)]
+        zone_ids = [i for rects, _ in zones for i in range(len(rects))]
+        zone_colors = [color for rects, color in zones for _ in rects]
+        zone_rects = scale(rect_points(np.array(
+            [rect for rects, _ in zones for rect in rects], dtype=np.float64).reshape(-1, 3, 2)))
+
+        polylines = [(scale(points).ravel().tolist(), { "fill": MapCanvas.OBSTACLE_COLOR })
+                     for points in obstacle_polylines(map_config.obstacles)]
+        closed_zone_rects = np.concatenate((zone_rects, zone_rects[:, :1]), axis=1)
+        polylines += [(coords, { "fill": color }) for coords, color
+                      in zip(closed_zone_rects.reshape(-1, 10).tolist(), zone_colors)]
+        self._update_pooled_items(self.line_items, polylines, self.canvas.create_line)
+
+        zone_middles = (np.min(zone_rects, axis=1) + np.max(zone_rects, axis=1)) / 2
+        for zone_id, (x, y) in zip(zone_ids, zone_middles.tolist()):
             self.canvas.create_text(
-                middle[0], middle[1], text=str(zone_id),
-                fill="black", font=('Helvetica 10 bold'))
-
-        def draw_waypoint(p: Vec2D, r: float, color="black", fill=None):
-            (x, y), r = scale(p), r * scaling
-            fill = fill if fill else color
-            self.canvas.create_oval(x-r, y-r, x+r, y+r, outline=color, fill=fill)
-
-        for s_x, e_x, s_y, e_y in map_config.obstacles:
-            if (s_x, s_y) != (e_x, e_y):
-                self.canvas.create_line(scale((s_x, s_y)), scale((e_x, e_y)), fill=MapCanvas.OBSTACLE_COLOR)
-
-        for i, rect in enumerate(map_config.robot_spawn_zones):
-            draw_zone(i, rect_points(rect), MapCanvas.ROBOT_SPAWN_COLOR)
-
-        for i, rect in enumerate(map_config.robot_goal_zones):
-            draw_zone(i, rect_points(rect), MapCanvas.ROBOT_GOAL_COLOR)
-
-        for i, rect in enumerate(map_config.ped_spawn_zones):
-            draw_zone(i, rect_points(rect), MapCanvas.PED_SPAWN_COLOR)
-
-        for i, rect in enumerate(map_config.ped_goal_zones):
-            draw_zone(i, rect_points(rect), MapCanvas.PED_GOAL_COLOR)
-
-        for i, rect in enumerate(map_config.ped_crowded_zones):
-            draw_zone(i, rect_points(rect), MapCanvas.PED_CROWDED_COLOR)
-
-        for route in map_config.robot_routes:
-            for p in route.waypoints:
-                draw_waypoint(p, 1, MapCanvas.ROBOT_ROUTE_COLOR)
-
-        for route in map_config.ped_routes:
-            for p in route.waypoints:
-                draw_waypoint(p, 1, MapCanvas.PED_ROUTE_COLOR)
+                x, y, text=str(zone_id), fill="black",
+                font=('Helvetica 10 bold'), tags=MapCanvas.TEMP_ITEMS_TAG)
+
+        def waypoint_ovals(routes: List[GlobalRoute], r: float, color="black", fill=None):
+            waypoints = [p for route in routes for p in route.waypoints]
+            waypoints = scale(np.array(waypoints, dtype=np.float64).reshape(-1, 2))
+            r, style = r * scaling, { "outline": color, "fill": fill if fill else color }
+            bounds = np.concatenate((waypoints - r, waypoints + r), axis=1)
+            return [(coords, style) for coords in bounds.tolist()]
+
+        ovals = waypoint_ovals(map_config.robot_routes, 1, MapCanvas.ROBOT_ROUTE_COLOR) \
+            + waypoint_ovals(map_config.ped_routes, 1, MapCanvas.PED_ROUTE_COLOR)
+        self._update_pooled_items(self.oval_items, ovals, self.canvas.create_oval)
+
+    def _update_pooled_items(
+            self, pool: List[int], items: List[Tuple[List[float], dict]],
+            create_item: Callable[..., int]):
+        # info: move the existing canvas items instead of re-creating all of them,
+        #       surplus items are hidden to be reused by one of the next renderings
+        for i, (coords, style) in enumerate(items):
+            if i < len(pool):
+                self.canvas.coords(pool[i], *coords)
+                self.canvas.itemconfigure(pool[i], state=tk.NORMAL, **style)
+            else:
+                pool.append(create_item(*coords, **style))
+
+        for item in pool[len(items):]:
+            self.canvas.itemconfigure(item, state=tk.HIDDEN)
+
+
+def rect_points(rects: np.ndarray) -> np.ndarray:
+    """Complete (N, 3, 2) zone rects ABC by the 4th corner D = A + (C - B)."""
+    p4 = rects[:, 0] + rects[:, 2] - rects[:, 1]
+    return np.concatenate((rects, p4[:, np.newaxis]), axis=1)
+
+
+def obstacle_polylines(obstacles: np.ndarray) -> List[np.ndarray]:
+    """Join consecutive obstacle edges (s_x, e_x, s_y, e_y) that share
+    an end / start point into polylines, such that each polygon can be
+    drawn as a single canvas item."""
+    obstacles = obstacles.reshape(-1, 4)
+    starts, ends = obstacles[:, [0, 2]], obstacles[:, [1, 3]]
+    is_line = np.any(starts != ends, axis=1) # remove fake lines that are just points
+    starts, ends = starts[is_line], ends[is_line]
+    if starts.shape[0] == 0:
+        return []
+
+    is_disconnected = np.any(starts[1:] != ends[:-1], axis=1)
+    split_ids = np.flatnonzero(is_disconnected) + 1
+    return [np.concatenate((s[:1], e)) for s, e
+            in zip(np.split(starts, split_ids), np.split(ends, split_ids))]
 
 
 class MapToolbarMode(IntEnum):
@@ -189,7 +209,10 @@ class TextEditor:
 
     def __init__(self, frame: tk.Frame, clipboard: Callable[[], str]):
         self.input = tks.ScrolledText(frame)
+        self.is_dirty = True
         self.input.bind("<Control-Key-a>", lambda e: self.select_all())
+        # info: <<Modified>> also covers edits without key events, e.g. pastes with the mouse
+        self.input.bind("<<Modified>>", lambda e: self._mark_dirty())
         # self.input.bind("<Control-Key-v>", lambda e: self.insert_text(clipboard()))
 
     @property
@@ -209,6 +232,16 @@ class TextEditor:
     def append_text(self, text: str):
         self.input.insert(tk.END, text)
 
+    def _mark_dirty(self):
+        # info: resetting the modified flag fires <<Modified>> as well
+        if self.input.edit_modified():
+            self.is_dirty = True
+
+    def reset_dirty(self):
+        # info: <<Modified>> only fires again once the modified flag got reset
+        self.is_dirty = False
+        self.input.edit_modified(False)
+
     def select_all(self):
         self.input.tag_add(tk.SEL, "1.0", tk.END)
         self.input.mark_set(tk.INSERT, "1.0")
@@ -223,6 +256,8 @@ class TextEditor:
 
 
 class MapEditor:
+    RELOAD_INTERVAL_MS = 200
+
     def __init__(self):
         TITLE = "RobotSF Map Editor"
         self.master = tk.Tk()
@@ -238,38 +273,33 @@ class MapEditor:
         self.text_editor = TextEditor(self.frame_editor, self.master.clipboard_get)
         self.map_toolbar = MapEditorToolbar(self.frame_toolbar, lambda mode: None)
 
-        self.is_shutdown_requested = False
-        self.map_rendering_thread: Union[Thread, None] = None
-        self.last_text = ""
+        self.last_text_hash = b""
         self.last_config: Union[VisualizableMapConfig, None] = None
         self._load_example_map()
 
     def launch(self):
         self.pack()
+        # info: reloading is scheduled on the Tk event loop instead of a separate
+        #       thread because Tk widgets mustn't be accessed from other threads
+        self.master.after(MapEditor.RELOAD_INTERVAL_MS, self._reload_map)
+        self.master.mainloop()
 
-        def reload_map():
+    def _reload_map(self):
+        if self.text_editor.is_dirty:
+            self.text_editor.reset_dirty()
             config_content = self.text_editor.text
+            # info: compare short digests instead of the full editor text
+            text_hash = hashlib.blake2b(config_content.encode(), digest_size=8).digest()
             map_config = parse_mapfile_text(config_content) \
-                if config_content != self.last_text else None
+                if text_hash != self.last_text_hash else None
             self.last_config = map_config if map_config else self.last_config
-            self.last_text = config_content if map_config else self.last_text
+            self.last_text_hash = text_hash if map_config else self.last_text_hash
             if map_config:
                 try:
                     self.map_canvas.render(map_config)
                 except:
                     print("unable to draw map")
-
-        def reload_map_as_daemon(frequency_hz: float, is_term: Callable[[], bool]):
-            reload_intercal_secs = 1 / frequency_hz
-            while not is_term():
-                reload_map()
-                sleep(reload_intercal_secs)
-
-        RELOAD_FREQUENCY = 5
-        args = (RELOAD_FREQUENCY, lambda: self.is_shutdown_requested)
-        self.map_rendering_thread = Thread(target=reload_map_as_daemon, args=args)
-        self.map_rendering_thread.start()
-        self.master.mainloop()
+        self.master.after(MapEditor.RELOAD_INTERVAL_MS, self._reload_map)
 
     def pack(self):
         self.frame_toolbar.pack(side=tk.RIGHT, fill="y")
@@ -280,9 +310,6 @@ class MapEditor:
         self.map_toolbar.pack()
 
     def on_closing(self):
-        if self.map_rendering_thread:
-            self.is_shutdown_requested = True
-            self.map_rendering_thread.join()
         self.master.destroy()
 
     def _load_example_map(self):
@@ -1,5 +1,5 @@
 import json
-from typing import Union, Tuple, List, Set
+from typing import Union, Tuple, List
 from dataclasses import dataclass, field
 
 import numpy as np
@@ -36,30 +36,25 @@ MAP_VERSION_V1 = "v1"
 MAP_VERSION_V2 = "v2"
 
 
-def determine_mapfile_version(text: str) -> Union[str, None]:
-    def intersect_sets(s1: Set, s2: Set) -> Set:
-        return {k for k in s1 if k in s2}
+REQUIRED_TOPLEVEL_KEYS = frozenset({ "x_margin", "y_margin" })
+OBSOLETE_V0_TOPLEVEL_KEYS = frozenset({ "Obstacles", "NumberObstacles", "Created" })
+REQUIRED_V1_KEYS = frozenset({ "obstacles", "ped_spawn_zones", "robot_spawn_zones", "robot_goal_zones", "robot_routes" })
+REQUIRED_V2_KEYS = frozenset({ "ped_routes", "ped_goal_zones", "ped_crowded_zones" })
 
-    def contains_all(s1: Set, comp: Set) -> bool:
-        return intersect_sets(s1, comp) == comp
 
+def determine_mapfile_version(map_data: dict) -> Union[str, None]:
     try:
-        map_data: dict = json.loads(text)
-
-        required_toplevel_keys = { "x_margin", "y_margin" }
-        if not contains_all(set(map_data.keys()), required_toplevel_keys):
+        keys = map_data.keys()
+        if not REQUIRED_TOPLEVEL_KEYS <= keys:
             return None
 
-        obsolete_v0_toplevel_keys = { "Obstacles", "NumberObstacles", "Created" }
-        if any([k for k in obsolete_v0_toplevel_keys if k in map_data]):
+        if not OBSOLETE_V0_TOPLEVEL_KEYS.isdisjoint(keys):
             return MAP_VERSION_V0
 
-        required_v1_keys = { "obstacles", "ped_spawn_zones", "robot_spawn_zones", "robot_goal_zones", "robot_routes" }
-        if not contains_all(set(map_data.keys()), required_v1_keys):
+        if not REQUIRED_V1_KEYS <= keys:
             return MAP_VERSION_V0
 
-        required_v2_keys = { "ped_routes", "ped_goal_zones", "ped_crowded_zones" }
-        if not contains_all(set(map_data.keys()), required_v2_keys):
+        if not REQUIRED_V2_KEYS <= keys:
             return MAP_VERSION_V1
 
         return MAP_VERSION_V2
@@ -67,19 +62,21 @@ def determine_mapfile_version(text: str) -> Union[str, None]:
         return None
 
 
-def parse_mapfile_text_v0(text: str) -> Union[VisualizableMapConfig, None]:
+def polygon_edges(polygons: List[List[Vec2D]]) -> np.ndarray:
+    """Convert closed polygons into an (N, 4) array of edges
+    with the layout (start_x, end_x, start_y, end_y)."""
+    all_edges = []
+    for vertices in polygons:
+        starts = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        ends = np.roll(starts, -1, axis=0)
+        all_edges.append(np.column_stack((starts[:, 0], ends[:, 0], starts[:, 1], ends[:, 1])))
+    return np.concatenate(all_edges) if all_edges else np.zeros((0, 4))
+
+
+def parse_map_data_v0(map_data: dict) -> Union[VisualizableMapConfig, None]:
     try:
-        map_data = json.loads(text)
-
-        all_lines = list()
-        for obstacle in map_data["Obstacles"]:
-            vertices: List[Vec2D] = map_data["Obstacles"][obstacle]["Vertex"]
-            edges = list(zip(vertices[:-1], vertices[1:])) \
-                + [(vertices[-1], vertices[0])]
-            for (s_x, s_y), (e_x, e_y) in edges:
-                line = [s_x, e_x, s_y, e_y]
-                all_lines.append(line)
-        obstacles = np.array(all_lines)
+        obstacles = polygon_edges(
+            [obstacle["Vertex"] for obstacle in map_data["Obstacles"].values()])
 
         x_margin = map_data["x_margin"]
         x_margin = (x_margin[0], x_margin[1])
@@ -92,19 +89,9 @@ def parse_mapfile_text_v0(text: str) -> Union[VisualizableMapConfig, None]:
         return None
 
 
-def parse_mapfile_text_v1(text: str) -> Union[VisualizableMapConfig, None]:
+def parse_map_data_v1(map_data: dict) -> Union[VisualizableMapConfig, None]:
     try:
-        map_data = json.loads(text)
-
-        all_lines = list()
-        for vertices in map_data["obstacles"]:
-            vertices: List[Vec2D]
-            edges = list(zip(vertices[:-1], vertices[1:])) \
-                + [(vertices[-1], vertices[0])]
-            for (s_x, s_y), (e_x, e_y) in edges:
-                line = [s_x, e_x, s_y, e_y]
-                all_lines.append(line)
-        obstacles = np.array(all_lines)
+        obstacles = polygon_edges(map_data["obstacles"])
 
         routes = [GlobalRoute(o["spawn_id"], o["goal_id"], o["waypoints"])
                   for o in map_data["robot_routes"]]
@@ -127,19 +114,9 @@ def parse_mapfile_text_v1(text: str) -> Union[VisualizableMapConfig, None]:
         return None
 
 
-def parse_mapfile_text_v2(text: str) -> Union[VisualizableMapConfig, None]:
+def parse_map_data_v2(map_data: dict) -> Union[VisualizableMapConfig, None]:
     try:
-        map_data = json.loads(text)
-
-        all_lines = list()
-        for vertices in map_data["obstacles"]:
-            vertices: List[Vec2D]
-            edges = list(zip(vertices[:-1], vertices[1:])) \
-                + [(vertices[-1], vertices[0])]
-            for (s_x, s_y), (e_x, e_y) in edges:
-                line = [s_x, e_x, s_y, e_y]
-                all_lines.append(line)
-        obstacles = np.array(all_lines)
+        obstacles = polygon_edges(map_data["obstacles"])
 
         robot_routes = [GlobalRoute(o["spawn_id"], o["goal_id"], o["waypoints"])
                         for o in map_data["robot_routes"]]
@@ -167,16 +144,21 @@ def parse_mapfile_text_v2(text: str) -> Union[VisualizableMapConfig, None]:
 
 
 parsers_by_version = {
-    MAP_VERSION_V0: parse_mapfile_text_v0,
-    MAP_VERSION_V1: parse_mapfile_text_v1,
-    MAP_VERSION_V2: parse_mapfile_text_v2,
+    MAP_VERSION_V0: parse_map_data_v0,
+    MAP_VERSION_V1: parse_map_data_v1,
+    MAP_VERSION_V2: parse_map_data_v2,
 }
 
 
 def parse_mapfile_text(text: str) -> Union[VisualizableMapConfig, None]:
-    version = determine_mapfile_version(text)
+    try:
+        map_data: dict = json.loads(text)
+    except:
+        map_data = None
+
+    version = determine_mapfile_version(map_data) if isinstance(map_data, dict) else None
     print(f"file version is {version if version else 'invalid'}")
-    return parsers_by_version[version](text) if version else None
+    return parsers_by_version[version](map_data) if version else None
 
 
 def format_waypoints_as_json(waypoints: List[Vec2D]) -> str:
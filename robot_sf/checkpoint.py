@@ -0,0 +1,66 @@
+from copy import deepcopy
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from stable_baselines3.common.callbacks import CheckpointCallback
+from stable_baselines3.common.save_util import save_to_zip_file, recursive_getattr
+
+
+class AsyncCheckpointCallback(CheckpointCallback):
+    """Representing a checkpoint callback that takes a snapshot of the model
+    on the training thread and writes it to disk on a background thread,
+    so the rollouts continue while the checkpoint file is being written.
+    The checkpoints have the same format as the ones of model.save()."""
+
+    def __init__(self, *args, **kwargs):
+        super(AsyncCheckpointCallback, self).__init__(*args, **kwargs)
+        self.save_worker = ThreadPoolExecutor(max_workers=1)
+        self.pending_save: Optional[Future] = None
+
+    def _on_step(self) -> bool:
+        if self.n_calls % self.save_freq == 0:
+            model_path = self._checkpoint_path(extension="zip")
+            data, params, pytorch_variables = self._snapshot_model()
+            self._wait_for_pending_save()
+            self.pending_save = self.save_worker.submit(
+                save_to_zip_file, model_path, data=data, params=params, pytorch_variables=pytorch_variables)
+            if self.verbose >= 2:
+                print(f"Saving model checkpoint to {model_path}")
+            self._save_extras()
+        return True
+
+    def _save_extras(self):
+        # info: same as in CheckpointCallback._on_step(), the replay buffer and
+        #       the VecNormalize statistics are saved on the training thread
+        if self.save_replay_buffer and hasattr(self.model, "replay_buffer") \
+                and self.model.replay_buffer is not None:
+            replay_buffer_path = self._checkpoint_path("replay_buffer_", extension="pkl")
+            self.model.save_replay_buffer(replay_buffer_path)
+            if self.verbose >= 2:
+                print(f"Saving model replay buffer checkpoint to {replay_buffer_path}")
+
+        if self.save_vecnormalize and self.model.get_vec_normalize_env() is not None:
+            vec_normalize_path = self._checkpoint_path("vecnormalize_", extension="pkl")
+            self.model.get_vec_normalize_env().save(vec_normalize_path)
+            if self.verbose >= 2:
+                print(f"Saving model VecNormalize to {vec_normalize_path}")
+
+    def _on_training_end(self):
+        self._wait_for_pending_save()
+
+    def _snapshot_model(self):
+        # info: same selection of attributes and state dicts as in BaseAlgorithm.save(),
+        #       deep copies decouple the snapshot from the ongoing training
+        model = self.model
+        state_dicts_names, torch_variable_names = model._get_torch_save_params()
+        exclude = set(model._excluded_save_params()).union(
+            [name.split(".")[0] for name in state_dicts_names + torch_variable_names])
+        data = deepcopy({k: v for k, v in model.__dict__.items() if k not in exclude})
+        params = deepcopy(model.get_parameters())
+        pytorch_variables = {name: deepcopy(recursive_getattr(model, name)) for name in torch_variable_names}
+        return data, params, pytorch_variables
+
+    def _wait_for_pending_save(self):
+        if self.pending_save is not None:
+            self.pending_save.result()
+            self.pending_save = None
@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from typing import List
 from enum import IntEnum
 
+import numpy as np
+
 
 class EnvOutcome(IntEnum):
     REACHED_GOAL=0
@@ -108,30 +110,93 @@ class EnvMetrics:
         self.route_outcomes.append(outcome)
 
 
+NO_OUTCOME = -1
+
+
 @dataclass
 class VecEnvMetrics:
-    metrics: List[EnvMetrics]
+    """Representing the metrics of all environments of a vectorized environment.
+    The recent outcomes of each environment are kept in a ring buffer
+    with the same capacity as the outcome cache of EnvMetrics. The amount
+    of each outcome per environment is counted along with the ring buffer,
+    so the rates are computed from the counts without scanning the buffers."""
+    num_envs: int
+    cache_size: int = 10
+    route_outcomes: np.ndarray = field(init=False)
+    intermediate_goal_outcomes: np.ndarray = field(init=False)
+    route_heads: np.ndarray = field(init=False)
+    intermediate_goal_heads: np.ndarray = field(init=False)
+    route_outcome_counts: np.ndarray = field(init=False)
+    intermediate_goal_outcome_counts: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        # info: EnvMetrics keeps up to cache_size + 1 outcomes before evicting the oldest
+        capacity = self.cache_size + 1
+        self.route_outcomes = np.full((self.num_envs, capacity), NO_OUTCOME, dtype=np.int8)
+        self.intermediate_goal_outcomes = np.full((self.num_envs, capacity), NO_OUTCOME, dtype=np.int8)
+        self.route_heads = np.zeros((self.num_envs), dtype=np.int64)
+        self.intermediate_goal_heads = np.zeros((self.num_envs), dtype=np.int64)
+        # info: the last column counts the empty slots (index NO_OUTCOME = -1)
+        num_outcomes = len(EnvOutcome) + 1
+        self.route_outcome_counts = np.zeros((self.num_envs, num_outcomes), dtype=np.int64)
+        self.intermediate_goal_outcome_counts = np.zeros((self.num_envs, num_outcomes), dtype=np.int64)
+        self.route_outcome_counts[:, NO_OUTCOME] = capacity
+        self.intermediate_goal_outcome_counts[:, NO_OUTCOME] = capacity
 
     @property
     def route_completion_rate(self) -> float:
-        return sum([m.route_completion_rate for m in self.metrics]) / len(self.metrics)
+        return self._mean_rate(self.route_outcome_counts, EnvOutcome.REACHED_GOAL)
 
     @property
     def interm_goal_completion_rate(self) -> float:
-        return sum([m.interm_goal_completion_rate for m in self.metrics]) / len(self.metrics)
+        return self._mean_rate(self.intermediate_goal_outcome_counts, EnvOutcome.REACHED_GOAL)
 
     @property
     def timeout_rate(self) -> float:
-        return sum([m.timeout_rate for m in self.metrics]) / len(self.metrics)
+        return self._mean_rate(self.route_outcome_counts, EnvOutcome.TIMEOUT)
 
     @property
     def obstacle_collision_rate(self) -> float:
-        return sum([m.obstacle_collision_rate for m in self.metrics]) / len(self.metrics)
+        return self._mean_rate(self.route_outcome_counts, EnvOutcome.OBSTACLE_COLLISION)
 
     @property
     def pedestrian_collision_rate(self) -> float:
-        return sum([m.pedestrian_collision_rate for m in self.metrics]) / len(self.metrics)
+        return self._mean_rate(self.route_outcome_counts, EnvOutcome.PEDESTRIAN_COLLISION)
 
     def update(self, metas: List[dict]):
-        for metric, meta in zip(self.metrics, metas):
-            metric.update(meta)
+        num_envs = self.num_envs
+        is_ped_coll = np.fromiter((m["is_pedestrian_collision"] for m in metas), bool, num_envs)
+        is_obst_coll = np.fromiter((m["is_obstacle_collision"] for m in metas), bool, num_envs)
+        is_at_goal = np.fromiter((m["is_robot_at_goal"] for m in metas), bool, num_envs)
+        is_route_complete = np.fromiter((m["is_route_complete"] for m in metas), bool, num_envs)
+        is_timeout = np.fromiter((m["is_timesteps_exceeded"] for m in metas), bool, num_envs)
+
+        # info: the outcomes are prioritized in the same order as in EnvMetrics
+        interm_outcomes = np.select(
+            [is_ped_coll, is_obst_coll, is_at_goal, is_timeout],
+            [EnvOutcome.PEDESTRIAN_COLLISION, EnvOutcome.OBSTACLE_COLLISION,
+             EnvOutcome.REACHED_GOAL, EnvOutcome.TIMEOUT], NO_OUTCOME)
+        route_outcomes = np.select(
+            [is_ped_coll, is_obst_coll, is_route_complete, is_timeout],
+            [EnvOutcome.PEDESTRIAN_COLLISION, EnvOutcome.OBSTACLE_COLLISION,
+             EnvOutcome.REACHED_GOAL, EnvOutcome.TIMEOUT], NO_OUTCOME)
+
+        self._push_outcomes(self.intermediate_goal_outcomes, self.intermediate_goal_heads,
+                            self.intermediate_goal_outcome_counts, interm_outcomes)
+        self._push_outcomes(self.route_outcomes, self.route_heads,
+                            self.route_outcome_counts, route_outcomes)
+
+    def _push_outcomes(self, cache: np.ndarray, heads: np.ndarray, counts: np.ndarray, outcomes: np.ndarray):
+        env_ids = np.nonzero(outcomes != NO_OUTCOME)[0]
+        if env_ids.shape[0] == 0:
+            return
+        # info: each env occurs at most once, so the counts can be updated by fancy indexing
+        env_heads, new_outcomes = heads[env_ids], outcomes[env_ids]
+        counts[env_ids, cache[env_ids, env_heads]] -= 1
+        counts[env_ids, new_outcomes] += 1
+        cache[env_ids, env_heads] = new_outcomes
+        heads[env_ids] = (env_heads + 1) % cache.shape[1]
+
+    def _mean_rate(self, counts: np.ndarray, outcome: EnvOutcome) -> float:
+        num_outcomes = np.maximum(self.cache_size + 1 - counts[:, NO_OUTCOME], 1)
+        return float(np.mean(counts[:, outcome] / num_outcomes))
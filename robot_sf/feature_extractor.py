@@ -1,12 +1,15 @@
 
 # WARNING: don't move this script or else loading trained SB3 policies might not work
 
-from typing import List
+import warnings
+from copy import deepcopy
+from typing import List, Callable, Optional
 
 import numpy as np
 from gym import spaces
 import torch as th
 from torch import nn
+from torch.ao import quantization as quant
 from stable_baselines3.common.torch_layers import BaseFeaturesExtractor
 
 from robot_sf.robot_env import OBS_DRIVE_STATE, OBS_RAYS
@@ -18,11 +21,13 @@ class DynamicsExtractor(BaseFeaturesExtractor):
             use_ray_conv: bool=True,
             num_filters: List[int]=[64, 16, 16, 16],
             kernel_sizes: List[int]=[3, 3, 3, 3],
-            dropout_rates: List[float]=[0.3, 0.3, 0.3, 0.3]):
+            dropout_rates: List[float]=[0.3, 0.3, 0.3, 0.3],
+            compile_ray_extractor: bool=False):
         rays_space: spaces.Box = observation_space.spaces[OBS_RAYS]
         drive_state_space: spaces.Box = observation_space.spaces[OBS_DRIVE_STATE]
         drive_state_features = np.prod(drive_state_space.shape)
         num_rays = rays_space.shape[1]
+        self.rays_shape = rays_space.shape
         ray_features = num_filters[3] * (num_rays // 16) \
             if use_ray_conv else np.prod(rays_space.shape)
         total_features = ray_features + drive_state_features
@@ -53,7 +58,79 @@ class DynamicsExtractor(BaseFeaturesExtractor):
 
         self.drive_state_extractor = nn.Sequential(nn.Flatten())
 
+        # info: only the forward function is compiled, the compiled module must not be
+        #       registered as sub-module, otherwise the state dict keys would change
+        self.optimized_ray_forward: Optional[Callable[[th.Tensor], th.Tensor]] = None
+        if compile_ray_extractor:
+            self._compile_ray_extractor()
+
+    def _compile_ray_extractor(self):
+        if not hasattr(th, "compile"):
+            warnings.warn("torch.compile() requires PyTorch >= 2.0, ray extractor is not compiled!")
+            return
+
+        # info: th.compile() is lazy, so a dummy forward pass triggers the compilation
+        #       to surface graph breaks and backend errors here instead of during training
+        compiled_forward = th.compile(self.ray_extractor.forward, dynamic=False, fullgraph=True)
+        try:
+            compiled_forward(th.zeros((1, *self.rays_shape)))
+        except Exception as ex:
+            warnings.warn(f"failed to compile ray extractor, falling back to eager mode: {ex}")
+            return
+        self.optimized_ray_forward = compiled_forward
+        th.backends.cudnn.benchmark = True
+
+    def switch_to_eval(self):
+        """Prepare the extractor for inference by removing the dropout layers
+        which are a no-op outside of training. The dropouts are replaced by
+        identities in-place, so the state dict stays compatible."""
+        for i, layer in enumerate(self.ray_extractor):
+            if isinstance(layer, nn.Dropout):
+                self.ray_extractor[i] = nn.Identity()
+        self.eval()
+
+    def quantize_for_inference(self, calibration_rays: th.Tensor):
+        """Quantize the ray extractor's convolutions to int8 for CPU inference.
+        The ray observations of a small rollout are used for calibrating the
+        activation ranges. The fp32 layers are kept for the state dict.
+        The quantized layers always run on the CPU, rays on other devices
+        are moved to the CPU and the features are moved back afterwards."""
+        self.switch_to_eval()
+        conv_ids = [i for i, layer in enumerate(self.ray_extractor) if isinstance(layer, nn.Conv1d)]
+        if not conv_ids:
+            warnings.warn("ray extractor has no convolutions, nothing to quantize!")
+            return
+
+        # info: dynamic quantization doesn't support conv layers,
+        #       so the convs are quantized statically instead
+        quant_model = nn.Sequential(
+            quant.QuantStub(), deepcopy(self.ray_extractor), quant.DeQuantStub())
+        quant_model.eval()
+        quant.fuse_modules(quant_model, [[f"1.{i}", f"1.{i+1}"] for i in conv_ids], inplace=True)
+        quant_model.qconfig = quant.get_default_qconfig("fbgemm")
+        quant.prepare(quant_model, inplace=True)
+        with th.no_grad():
+            quant_model(calibration_rays.cpu())
+        quant.convert(quant_model, inplace=True)
+
+        def quantized_ray_forward(rays: th.Tensor) -> th.Tensor:
+            return quant_model(rays.cpu()).to(rays.device)
+        self.optimized_ray_forward = quantized_ray_forward
+
     def forward(self, obs: dict) -> th.Tensor:
-        ray_x = self.ray_extractor(obs[OBS_RAYS])
+        ray_x = self._ray_forward(obs[OBS_RAYS])
         drive_x = self.drive_state_extractor(obs[OBS_DRIVE_STATE])
         return th.cat([ray_x, drive_x], dim=1)
+
+    def _ray_forward(self, rays: th.Tensor) -> th.Tensor:
+        if self.optimized_ray_forward is None:
+            return self.ray_extractor(rays)
+
+        # info: the compiled forward might still recompile later on, e.g. after
+        #       moving the policy to another device, so fall back to eager mode on errors
+        try:
+            return self.optimized_ray_forward(rays)
+        except Exception as ex:
+            warnings.warn(f"optimized ray extractor failed, falling back to eager mode: {ex}")
+            self.optimized_ray_forward = None
+            return self.ray_extractor(rays)
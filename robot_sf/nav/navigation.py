@@ -17,6 +17,7 @@ class RouteNavigator:
     proximity_threshold: float = 1.0 # info: should be set to vehicle radius + goal radius
     pos: Vec2D = field(default=(0, 0))
     reached_waypoint: bool = False
+    cached_next_waypoint_orient: Optional[float] = field(default=None, init=False, repr=False)
 
     @property
     def reached_destination(self) -> bool:
@@ -32,6 +33,23 @@ class RouteNavigator:
         return self.waypoints[self.waypoint_id + 1] \
             if self.waypoint_id + 1 < len(self.waypoints) else None
 
+    @property
+    def next_waypoint_orient(self) -> Optional[float]:
+        """The orientation of the route segment from the current
+        towards the next waypoint (or None if there's no next waypoint)."""
+        next_waypoint = self.next_waypoint
+        if next_waypoint is None:
+            return None
+
+        # info: the orientation only depends on the waypoints, so it's recomputed
+        #       only after the cache got cleared by moving on to another waypoint or route
+        if self.cached_next_waypoint_orient is None:
+            current_waypoint = self.current_waypoint
+            self.cached_next_waypoint_orient = atan2(
+                next_waypoint[1] - current_waypoint[1],
+                next_waypoint[0] - current_waypoint[0])
+        return self.cached_next_waypoint_orient
+
     @property
     def initial_orientation(self) -> float:
         return atan2(self.waypoints[1][1] - self.waypoints[0][1],
@@ -41,12 +59,14 @@ class RouteNavigator:
         reached_waypoint = dist(self.current_waypoint, pos) <= self.proximity_threshold
         if reached_waypoint:
             self.waypoint_id = min(len(self.waypoints) - 1, self.waypoint_id + 1)
+            self.cached_next_waypoint_orient = None
         self.pos = pos
         self.reached_waypoint = reached_waypoint
 
     def new_route(self, route: List[Vec2D]):
         self.waypoints = route
         self.waypoint_id = 0
+        self.cached_next_waypoint_orient = None
 
 
 def sample_route(
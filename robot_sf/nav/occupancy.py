@@ -9,7 +9,7 @@ Circle2D = Tuple[Vec2D, float]
 Line2D = Tuple[Vec2D, Vec2D]
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def is_circle_circle_intersection(c_1: Circle2D, c_2: Circle2D) -> bool:
     center_1, radius_1 = c_1
     center_2, radius_2 = c_2
@@ -18,7 +18,7 @@ def is_circle_circle_intersection(c_1: Circle2D, c_2: Circle2D) -> bool:
     return dist_sq <= rad_sum_sq
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def is_circle_line_intersection(circle: Circle2D, segment: Line2D) -> bool:
     """Simple vector math implementation using quadratic solution formula."""
     (c_x, c_y), r = circle
@@ -51,6 +51,35 @@ def is_circle_line_intersection(circle: Circle2D, segment: Line2D) -> bool:
     return 0 <= -b - disc_root <= 2 * a or 0 <= -b + disc_root <= 2 * a
 
 
+@numba.njit(fastmath=True, cache=True)
+def is_circle_obstacle_intersection(circle: Circle2D, obstacles: np.ndarray) -> bool:
+    """Check the circle for intersections with any of the obstacle
+    line segments given as (N, 4) array of (s_x, s_y, e_x, e_y)."""
+    if len(obstacles.shape) != 2 or obstacles.shape[1] != 4:
+        return False
+
+    for i in range(obstacles.shape[0]):
+        s_x, s_y, e_x, e_y = obstacles[i, 0], obstacles[i, 1], obstacles[i, 2], obstacles[i, 3]
+        if is_circle_line_intersection(circle, ((s_x, s_y), (e_x, e_y))):
+            return True
+    return False
+
+
+@numba.njit(fastmath=True, cache=True)
+def is_circle_pedestrian_intersection(
+        circle: Circle2D, ped_positions: np.ndarray, ped_radius: float) -> bool:
+    """Check the circle for intersections with any of the pedestrian
+    circles whose centers are given as (N, 2) array."""
+    if len(ped_positions.shape) != 2 or ped_positions.shape[1] != 2:
+        return False
+
+    for i in range(ped_positions.shape[0]):
+        circle_ped = ((ped_positions[i, 0], ped_positions[i, 1]), ped_radius)
+        if is_circle_circle_intersection(circle, circle_ped):
+            return True
+    return False
+
+
 @dataclass
 class ContinuousOccupancy:
     width: float
@@ -78,22 +107,16 @@ class ContinuousOccupancy:
             return True
 
         collision_distance = self.robot_radius
-        circle_robot = ((robot_x, robot_y), collision_distance)
-        for s_x, s_y, e_x, e_y in self.obstacle_coords:
-            if is_circle_line_intersection(circle_robot, ((s_x, s_y), (e_x, e_y))):
-                return True
-        return False
+        circle_robot = ((float(robot_x), float(robot_y)), float(collision_distance))
+        return is_circle_obstacle_intersection(circle_robot, self.obstacle_coords)
 
     @property
     def is_pedestrian_collision(self) -> bool:
+        robot_x, robot_y = self.get_robot_coords()
         collision_distance = self.robot_radius
-        ped_radius = self.ped_radius
-        circle_robot = (self.get_robot_coords(), collision_distance)
-        for ped_x, ped_y in self.pedestrian_coords:
-            circle_ped = ((ped_x, ped_y), ped_radius)
-            if is_circle_circle_intersection(circle_robot, circle_ped):
-                return True
-        return False
+        circle_robot = ((float(robot_x), float(robot_y)), float(collision_distance))
+        return is_circle_pedestrian_intersection(
+            circle_robot, self.pedestrian_coords, float(self.ped_radius))
 
     @property
     def is_robot_robot_collision(self) -> bool:
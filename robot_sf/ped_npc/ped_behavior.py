@@ -79,4 +79,4 @@ class FollowRouteBehavior:
         spawn_positions = sample_zone(spawn_zone, num_peds)
         self.groups.reposition_group(gid, spawn_positions)
         self.groups.redirect_group(gid, nav.waypoints[0])
-        nav.waypoint_id = 0
+        nav.new_route(nav.waypoints)
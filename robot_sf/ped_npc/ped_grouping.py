@@ -1,4 +1,4 @@
-from typing import List, Set, Dict, Tuple, Callable
+from typing import List, Set, Dict, Tuple, Callable, Optional
 from dataclasses import dataclass, field
 from copy import deepcopy
 
@@ -42,12 +42,17 @@ class PedestrianGroupings:
     states: PedestrianStates
     groups: Dict[int, Set[int]] = field(default_factory=dict)
     group_by_ped_id: Dict[int, int] = field(default_factory=dict)
+    _cached_groups_as_lists: Optional[List[List[int]]] = field(init=False, default=None)
 
     @property
     def groups_as_lists(self) -> List[List[int]]:
         # info: this facilitates slicing over numpy arrays
         #       for some reason, numpy cannot slide over indices provided as set ...
-        return [list(ped_ids) for ped_ids in self.groups.values()]
+        # info: the lists are requested by the simulator on every step,
+        #       so they are only rebuilt when the group memberships change
+        if self._cached_groups_as_lists is None:
+            self._cached_groups_as_lists = [list(ped_ids) for ped_ids in self.groups.values()]
+        return self._cached_groups_as_lists
 
     @property
     def group_ids(self) -> Set[int]:
@@ -68,6 +73,7 @@ class PedestrianGroupings:
         return self.states.goal_of(any_ped_id_of_group)
 
     def new_group(self, ped_ids: Set[int]) -> int:
+        self._cached_groups_as_lists = None
         new_gid = max(self.groups.keys()) + 1 if self.groups.keys() else 0
         self.groups[new_gid] = ped_ids.copy()
         for ped_id in ped_ids:
@@ -82,6 +88,7 @@ class PedestrianGroupings:
         for ped_id in ped_ids:
             self.new_group({ped_id})
         self.groups[group_id].clear()
+        self._cached_groups_as_lists = None
 
     def redirect_group(self, group_id: int, new_goal: Vec2D):
         for ped_id in self.groups[group_id]:
@@ -50,7 +50,7 @@ def sample_route(
     x_offsets = clip_spread(np.random.normal(center[0], std_dev, (num_samples, 1)))
     y_offsets = clip_spread(np.random.normal(center[1], std_dev, (num_samples, 1)))
     points = np.concatenate((x_offsets, y_offsets), axis=1) + center
-    return [(x, y) for x, y in points], sec_id
+    return [(x, y) for x, y in points.tolist()], sec_id
 
 
 @dataclass
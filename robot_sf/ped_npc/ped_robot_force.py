@@ -1,4 +1,4 @@
-from typing import Tuple, Callable
+from typing import Tuple, Callable, Optional
 from dataclasses import dataclass
 
 import numpy as np
@@ -29,45 +29,51 @@ class PedRobotForce:
         self.peds = peds
         self.get_robot_pos = get_robot_pos
         self.last_forces = 0.0
+        self.force_buffer: Optional[np.ndarray] = None
+        self.reload_config()
 
-    def __call__(self) -> np.ndarray:
-        threshold = self.config.activation_threshold \
+    def reload_config(self):
+        """Cache the config values used on each step. Needs to be called
+        again when the config is modified after creating the force."""
+        self.threshold = self.config.activation_threshold \
             + self.peds.agent_radius + self.config.robot_radius
+        self.force_multiplier = self.config.force_multiplier
+
+    def __call__(self) -> np.ndarray:
         ped_positions = self.peds.pos()
-        robot_pos = self.get_robot_pos()
-        forces = np.zeros((self.peds.size(), 2))
-        ped_robot_force(forces, ped_positions, robot_pos, threshold)
-        forces = forces * self.config.force_multiplier
+        robot_x, robot_y = self.get_robot_pos()
+        # info: the force buffer is re-used across steps, it's only re-allocated
+        #       when the amount of pedestrians changes
+        num_peds = self.peds.size()
+        if self.force_buffer is None or self.force_buffer.shape[0] != num_peds:
+            self.force_buffer = np.zeros((num_peds, 2))
+        forces = self.force_buffer
+        forces.fill(0.0)
+        ped_robot_force(
+            forces, ped_positions, robot_x, robot_y,
+            self.threshold, self.force_multiplier)
         self.last_forces = forces
         return forces
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def ped_robot_force(
         out_forces: np.ndarray, ped_positions: np.ndarray,
-        robot_pos: Vec2D, threshold: float):
-
-    for i, ped_pos in enumerate(ped_positions):
-        distance = euclid_dist(robot_pos, ped_pos)
-        if distance <= threshold:
-            dx_dist, dy_dist = der_euclid_dist(ped_pos, robot_pos, distance)
-            out_forces[i] = potential_field_force(distance, dx_dist, dy_dist)
-
-
-@numba.njit(fastmath=True)
-def euclid_dist(v_1: Vec2D, v_2: Vec2D) -> float:
-    return ((v_1[0] - v_2[0])**2 + (v_1[1] - v_2[1])**2)**0.5
-
-
-@numba.njit(fastmath=True)
-def der_euclid_dist(p1: Vec2D, p2: Vec2D, distance: float) -> Vec2D:
-    # info: distance is an expensive operation and therefore pre-computed
-    dx1_dist = (p1[0] - p2[0]) / distance
-    dy1_dist = (p1[1] - p2[1]) / distance
-    return dx1_dist, dy1_dist
-
-
-@numba.njit(fastmath=True)
-def potential_field_force(dist: float, dx_dist: float, dy_dist: float) -> Tuple[float, float]:
-    der_potential = 1 / pow(dist, 3)
-    return der_potential * dx_dist, der_potential * dy_dist
+        robot_x: float, robot_y: float, threshold: float,
+        force_multiplier: float):
+    """Compute the repulsive potential field force of the robot onto each
+    pedestrian within the activation threshold. The distance, its derivative
+    and the potential's derivative 1 / dist³ are fused into a single pass."""
+
+    # info: most pedestrians are out of reach, so rule them out by the
+    #       squared distance before computing any square roots
+    threshold_sq = threshold**2
+    for i in range(ped_positions.shape[0]):
+        dx_dist = ped_positions[i, 0] - robot_x
+        dy_dist = ped_positions[i, 1] - robot_y
+        distance_sq = dx_dist**2 + dy_dist**2
+        if distance_sq <= threshold_sq:
+            # info: 1 / dist³ potential times the normalized direction dx / dist
+            scale = force_multiplier / distance_sq**2
+            out_forces[i, 0] = dx_dist * scale
+            out_forces[i, 1] = dy_dist * scale
@@ -12,4 +12,4 @@ def sample_zone(zone: Zone, num_samples: int) -> List[Vec2D]:
     rel_width = np.random.uniform(0, 1, (num_samples, 1))
     rel_height = np.random.uniform(0, 1, (num_samples, 1))
     points = b + rel_width * vec_ba + rel_height * vec_bc
-    return [(x, y) for x, y in points]
+    return [(x, y) for x, y in points.tolist()]
@@ -0,0 +1,44 @@
+from typing import List
+
+import numpy as np
+
+from robot_sf.nav.occupancy import \
+    is_circle_circle_intersection, is_circle_obstacle_intersection, is_circle_pedestrian_intersection
+from robot_sf.sensor.range_sensor import raycast, range_postprocessing
+from robot_sf.sensor.goal_sensor import _target_sensor_obs
+from robot_sf.robot.differential_drive import differential_drive_step
+from robot_sf.ped_npc.ped_robot_force import ped_robot_force
+
+
+def _array_layouts(num_rows: int, num_cols: int) -> List[np.ndarray]:
+    # info: the simulator passes column slices of larger arrays (e.g. the obstacles'
+    #       or pedestrians' state arrays), numba compiles those as non-contiguous arrays
+    return [np.zeros((num_rows, num_cols)), np.zeros((num_rows, num_cols + 1))[:, :num_cols]]
+
+
+def pre_compile(num_rays: int=272):
+    """Compile all numba kernels of the simulation step with the argument
+    types they receive during training. As the kernels are compiled with
+    cache=True, this fills numba's on-disk cache, so each worker process
+    of a vectorized environment loads the kernels instead of compiling them."""
+
+    circle = ((0.0, 0.0), 1.0)
+    for obstacles in _array_layouts(1, 4):
+        is_circle_obstacle_intersection(circle, obstacles)
+    for ped_pos in _array_layouts(1, 2):
+        is_circle_pedestrian_intersection(circle, ped_pos, 0.4)
+    is_circle_circle_intersection(circle, circle)
+
+    ray_angles = np.linspace(0, 2 * np.pi, num_rays + 1)[:-1]
+    for obstacles in _array_layouts(1, 4):
+        for ped_pos in _array_layouts(1, 2):
+            ranges = raycast((0.0, 0.0), obstacles, 10.0, ped_pos, 0.4, ray_angles)
+    range_postprocessing(ranges, np.array([0.005, 0.002]), 10.0)
+    _target_sensor_obs(0.0, 0.0, 0.0, 1.0, 1.0, 0.0, True)
+
+    # info: parallel kernels like differential_drive_move_batch() are skipped on purpose,
+    #       running them starts numba's threading layer which isn't fork-safe
+    differential_drive_step(*[0.0] * 7, 0.0, 0.0, 0.1, 2.0, 0.5, 0.05, 0.3)
+
+    for ped_pos in _array_layouts(1, 2):
+        ped_robot_force(np.zeros((1, 2)), ped_pos, 1.0, 1.0, 2.0, 10.0)
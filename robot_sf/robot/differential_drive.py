@@ -1,8 +1,9 @@
 from math import sin, cos
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, InitVar
 from typing import Tuple
 
 import numpy as np
+import numba
 from gym import spaces
 
 
@@ -33,74 +34,117 @@ class DifferentialDriveSettings:
 
 @dataclass
 class DifferentialDriveState:
-    pose: RobotPose
+    init_pose: InitVar[RobotPose]
     velocity: PolarVec2D = field(default=(0, 0))
     last_wheel_speeds: WheelSpeedState = field(default=(0, 0))
     wheel_speeds: WheelSpeedState = field(default=(0, 0))
+    # info: the pose is stored as plain floats to avoid allocating tuples on each move
+    x: float = field(init=False)
+    y: float = field(init=False)
+    orient: float = field(init=False)
+
+    def __post_init__(self, init_pose: RobotPose):
+        self.pose = init_pose
+
+    @property
+    def pose(self) -> RobotPose:
+        return (self.x, self.y), self.orient
+
+    @pose.setter
+    def pose(self, new_pose: RobotPose):
+        (x, y), orient = new_pose
+        self.x, self.y, self.orient = float(x), float(y), float(orient)
 
 
 DifferentialDriveAction = Tuple[float, float] # (linear velocity, angular velocity)
 
 
+# info: column layout of the (N, 7) state arrays processed by move_batch()
+STATE_X, STATE_Y, STATE_ORIENT = 0, 1, 2
+STATE_VEL_LINEAR, STATE_VEL_ANGULAR = 3, 4
+STATE_WHEEL_LEFT, STATE_WHEEL_RIGHT = 5, 6
+
+
+@numba.njit(fastmath=True, cache=True)
+def differential_drive_step(
+        x: float, y: float, orient: float, vel_linear: float, vel_angular: float,
+        wheel_left: float, wheel_right: float, action_linear: float, action_angular: float,
+        d_t: float, max_linear_speed: float, max_angular_speed: float,
+        wheel_radius: float, interaxis_length: float
+    ) -> Tuple[float, float, float, float, float, float, float]:
+    """Compute the next state of a differential drive by applying the action
+    for the given time span, returns the tuple (x, y, orient, linear velocity,
+    angular velocity, left wheel speed, right wheel speed)."""
+
+    # robot velocity
+    dot_x = min(max(vel_linear + action_linear, 0.0), max_linear_speed)
+    dot_orient = min(max(vel_angular + action_angular, -max_angular_speed), max_angular_speed)
+
+    # resulting wheel speeds
+    diff = interaxis_length * dot_orient / 2
+    new_wheel_left = (dot_x - diff) / wheel_radius
+    new_wheel_right = (dot_x + diff) / wheel_radius
+
+    # covered distance
+    avg_wheel_left = (wheel_left + new_wheel_left) / 2
+    avg_wheel_right = (wheel_right + new_wheel_right) / 2
+    distance_covered = wheel_radius / 2 * (avg_wheel_left + avg_wheel_right) * d_t
+
+    # new orientation
+    new_orient = orient + wheel_radius / interaxis_length * (avg_wheel_right - avg_wheel_left) * d_t
+
+    # odometry
+    rel_rotation = (orient + new_orient) / 2
+    new_x = x + distance_covered * cos(rel_rotation)
+    new_y = y + distance_covered * sin(rel_rotation)
+    return new_x, new_y, new_orient, dot_x, dot_orient, new_wheel_left, new_wheel_right
+
+
+@numba.njit(fastmath=True, parallel=True, cache=True)
+def differential_drive_move_batch(
+        states: np.ndarray, actions: np.ndarray, d_t: float,
+        max_linear_speed: float, max_angular_speed: float,
+        wheel_radius: float, interaxis_length: float):
+    for i in numba.prange(states.shape[0]):
+        new_x, new_y, new_orient, dot_x, dot_orient, new_wheel_left, new_wheel_right = \
+            differential_drive_step(
+                states[i, STATE_X], states[i, STATE_Y], states[i, STATE_ORIENT],
+                states[i, STATE_VEL_LINEAR], states[i, STATE_VEL_ANGULAR],
+                states[i, STATE_WHEEL_LEFT], states[i, STATE_WHEEL_RIGHT],
+                actions[i, 0], actions[i, 1], d_t, max_linear_speed,
+                max_angular_speed, wheel_radius, interaxis_length)
+        states[i, STATE_X], states[i, STATE_Y], states[i, STATE_ORIENT] = new_x, new_y, new_orient
+        states[i, STATE_VEL_LINEAR], states[i, STATE_VEL_ANGULAR] = dot_x, dot_orient
+        states[i, STATE_WHEEL_LEFT], states[i, STATE_WHEEL_RIGHT] = new_wheel_left, new_wheel_right
+
+
 @dataclass
 class DifferentialDriveMotion:
     config: DifferentialDriveSettings
 
     def move(self, state: DifferentialDriveState, action: PolarVec2D, d_t: float):
-        robot_vel = self._robot_velocity(state.velocity, action)
-        new_wheel_speeds = self._resulting_wheel_speeds(robot_vel)
-        distance = self._covered_distance(state.wheel_speeds, new_wheel_speeds, d_t)
-        new_orient = self._new_orientation(state.pose[1], state.wheel_speeds, new_wheel_speeds, d_t)
-        state.pose = self._compute_odometry(state.pose, (distance, new_orient))
+        new_x, new_y, new_orient, dot_x, dot_orient, new_wheel_left, new_wheel_right = \
+            differential_drive_step(
+                state.x, state.y, state.orient,
+                float(state.velocity[0]), float(state.velocity[1]),
+                float(state.wheel_speeds[0]), float(state.wheel_speeds[1]),
+                float(action[0]), float(action[1]), float(d_t),
+                float(self.config.max_linear_speed), float(self.config.max_angular_speed),
+                float(self.config.wheel_radius), float(self.config.interaxis_length))
+        state.x, state.y, state.orient = new_x, new_y, new_orient
         state.last_wheel_speeds = state.wheel_speeds
-        state.wheel_speeds = new_wheel_speeds
-        state.velocity = robot_vel
-
-    def _robot_velocity(self, velocity: PolarVec2D, action: PolarVec2D) -> PolarVec2D:
-        dot_x = velocity[0] + action[0]
-        dot_orient = velocity[1] + action[1]
-        dot_x = np.clip(dot_x, 0, self.config.max_linear_speed)
-        angular_max = self.config.max_angular_speed
-        dot_orient = np.clip(dot_orient, -angular_max, angular_max)
-        return dot_x, dot_orient
-
-    def _resulting_wheel_speeds(self, movement: PolarVec2D) -> WheelSpeedState:
-        dot_x, dot_orient = movement
-        diff = self.config.interaxis_length * dot_orient / 2
-        new_left_wheel_speed = (dot_x - diff) / self.config.wheel_radius
-        new_right_wheel_speed = (dot_x + diff) / self.config.wheel_radius
-        return new_left_wheel_speed, new_right_wheel_speed
-
-    def _covered_distance(
-            self, last_wheel_speeds: WheelSpeedState,
-            new_wheel_speeds: WheelSpeedState, d_t: float) -> float:
-        last_wheel_speed_left, last_wheel_speed_right = last_wheel_speeds
-        wheel_speed_left, wheel_speed_right = new_wheel_speeds
-
-        velocity = ((last_wheel_speed_left + wheel_speed_left) / 2 \
-            + (last_wheel_speed_right + wheel_speed_right) / 2)
-        distance_covered = self.config.wheel_radius / 2 * velocity * d_t
-        return distance_covered
-
-    def _new_orientation(
-            self, robot_orient: float, last_wheel_speeds: WheelSpeedState,
-            wheel_speeds: WheelSpeedState, d_t: float) -> float:
-        last_wheel_speed_left, last_wheel_speed_right = last_wheel_speeds
-        wheel_speed_left, wheel_speed_right = wheel_speeds
-
-        right_left_diff = (last_wheel_speed_right + wheel_speed_right) / 2 \
-            - (last_wheel_speed_left + wheel_speed_left) / 2
-        diff = self.config.wheel_radius / self.config.interaxis_length * right_left_diff * d_t
-        new_orient = robot_orient + diff
-        return new_orient
-
-    def _compute_odometry(self, old_pose: RobotPose, movement: PolarVec2D) -> RobotPose:
-        distance_covered, new_orient = movement
-        (robot_x, robot_y), old_orient = old_pose
-        rel_rotation = (old_orient + new_orient) / 2
-        new_x = robot_x + distance_covered * cos(rel_rotation)
-        new_y = robot_y + distance_covered * sin(rel_rotation)
-        return (new_x, new_y), new_orient
+        state.wheel_speeds = (new_wheel_left, new_wheel_right)
+        state.velocity = (dot_x, dot_orient)
+
+    def move_batch(self, states: np.ndarray, actions: np.ndarray, d_t: float):
+        """Move many robots sharing the same settings at once. The states are
+        expected as (N, 7) float64 array (see STATE_* columns), the actions
+        as (N, 2) array of (linear, angular) velocity changes.
+        The states are updated in-place."""
+        differential_drive_move_batch(
+            states, actions.astype(np.float64, copy=False), float(d_t),
+            float(self.config.max_linear_speed), float(self.config.max_angular_speed),
+            float(self.config.wheel_radius), float(self.config.interaxis_length))
 
 
 @dataclass
@@ -128,7 +172,7 @@ class DifferentialDriveRobot():
 
     @property
     def pos(self) -> Vec2D:
-        return self.state.pose[0]
+        return self.state.x, self.state.y
 
     @property
     def pose(self) -> RobotPose:
@@ -1,7 +1,6 @@
 from math import ceil
 from typing import Tuple, Callable, List, Protocol, Any
 from dataclasses import dataclass, field
-from copy import deepcopy
 from multiprocessing.pool import ThreadPool
 
 import numpy as np
@@ -70,10 +69,11 @@ class RobotState:
     is_timeout: bool = field(init=False, default=False)
     sim_time_elapsed: float = field(init=False, default=0.0)
     timestep: int = field(init=False, default=0)
+    max_sim_steps: int = field(init=False)
 
-    @property
-    def max_sim_steps(self) -> int:
-        return int(ceil(self.sim_time_limit / self.d_t))
+    def __post_init__(self):
+        # info: the step limit is constant, so it's computed once instead of on each meta_dict()
+        self.max_sim_steps = int(ceil(self.sim_time_limit / self.d_t))
 
     @property
     def is_terminal(self) -> bool:
@@ -112,6 +112,7 @@ class RobotState:
         return self.sensors.next_obs()
 
     def meta_dict(self) -> dict:
+        # info: a new dict is required per step because the infos are kept by SB3 / eval callbacks
         return {
             "step": self.episode * self.max_sim_steps,
             "episode": self.episode,
@@ -163,25 +164,25 @@ def init_simulators(
 
 def init_collision_and_sensors(
         sim: Simulator, env_config: EnvSettings, orig_obs_space: spaces.Dict):
-    num_robots = len(sim.robots)
     sim_config = env_config.sim_config
     robot_config = env_config.robot_config
     lidar_config = env_config.lidar_config
 
+    # info: the sensors are bound to each robot and its navigator directly instead of
+    #       looking them up by index, which would build lists of all robots on each call
     occupancies = [ContinuousOccupancy(
             sim.map_def.width, sim.map_def.height,
-            lambda: sim.robot_pos[i], lambda: sim.goal_pos[i],
+            lambda robot=robot: robot.pos, lambda nav=nav: nav.current_waypoint,
             lambda: sim.pysf_sim.env.obstacles_raw[:, :4], lambda: sim.ped_pos,
             robot_config.radius, sim_config.ped_radius, sim_config.goal_radius)
-        for i in range(num_robots)]
+        for robot, nav in zip(sim.robots, sim.robot_navs)]
 
     sensor_fusions: List[SensorFusion] = []
-    for r_id in range(num_robots):
-        ray_sensor = lambda r_id=r_id: lidar_ray_scan(
-            sim.robots[r_id].pose, occupancies[r_id], lidar_config)[0]
-        target_sensor = lambda r_id=r_id: target_sensor_obs(
-            sim.robots[r_id].pose, sim.goal_pos[r_id], sim.next_goal_pos[r_id])
-        speed_sensor = lambda r_id=r_id: sim.robots[r_id].current_speed
+    for robot, nav, occ in zip(sim.robots, sim.robot_navs, occupancies):
+        ray_sensor = lambda robot=robot, occ=occ: lidar_ray_scan(robot.pose, occ, lidar_config)[0]
+        target_sensor = lambda robot=robot, nav=nav: target_sensor_obs(
+            robot.pose, nav.current_waypoint, nav.next_waypoint, nav.next_waypoint_orient)
+        speed_sensor = lambda robot=robot: robot.current_speed
         sensor_fusions.append(SensorFusion(
             ray_sensor, speed_sensor, target_sensor,
             orig_obs_space, sim_config.use_next_goal))
@@ -256,16 +257,18 @@ class RobotEnv(Env):
         robot_pos = self.simulator.robot_poses[0][0]
         distances, directions = lidar_ray_scan(
             self.simulator.robot_poses[0], self.state.occupancy, self.env_config.lidar_config)
-        ray_vecs = zip(np.cos(directions) * distances, np.sin(directions) * distances)
-        ray_vecs_np = np.array(
-            [[[robot_pos[0], robot_pos[1]], [robot_pos[0] + x, robot_pos[1] + y]] for x, y in ray_vecs])
-        ped_actions = zip(self.simulator.pysf_sim.peds.pos(),
-                          self.simulator.pysf_sim.peds.pos() + self.simulator.pysf_sim.peds.vel() * 2)
-        ped_actions_np = np.array([[pos, vel] for pos, vel in ped_actions])
-
+        ray_vecs_np = np.empty((distances.shape[0], 2, 2), dtype=np.float32)
+        ray_vecs_np[:, 0] = robot_pos
+        ray_vecs_np[:, 1, 0] = robot_pos[0] + np.cos(directions) * distances
+        ray_vecs_np[:, 1, 1] = robot_pos[1] + np.sin(directions) * distances
+        ped_pos = self.simulator.pysf_sim.peds.pos()
+        ped_actions_np = np.stack((ped_pos, ped_pos + self.simulator.pysf_sim.peds.vel() * 2), axis=1)
+
+        # info: the visualization transforms the arrays in-place, so the
+        #       pedestrian positions need to be copied from the simulator
         state = VisualizableSimState(
             self.state.timestep, action, self.simulator.robot_poses[0],
-            deepcopy(self.simulator.ped_pos), ray_vecs_np, ped_actions_np)
+            self.simulator.ped_pos.astype(np.float32), ray_vecs_np, ped_actions_np)
 
         self.sim_ui.render(state)
 
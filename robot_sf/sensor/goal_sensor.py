@@ -1,7 +1,8 @@
-from math import atan2, dist
-from typing import Tuple, Union
+from math import atan2
+from typing import Tuple, Union, Optional
 
 import numpy as np
+import numba
 from gym import spaces
 
 Vec2D = Tuple[float, float]
@@ -9,39 +10,69 @@ PolarVec2D = Tuple[float, float]
 RobotPose = Tuple[Vec2D, float]
 
 
+@numba.njit(fastmath=True, cache=True)
 def norm_angle(angle: float) -> float:
     return (angle + np.pi) % (2 * np.pi) - np.pi
 
 
+@numba.njit(fastmath=True, cache=True)
+def _angle(p1_x: float, p1_y: float, p2_x: float, p2_y: float, p3_x: float, p3_y: float) -> float:
+    o_1 = atan2(p2_y - p1_y, p2_x - p1_x)
+    o_2 = atan2(p3_y - p2_y, p3_x - p2_x)
+    return norm_angle(o_2 - o_1)
+
+
+@numba.njit(fastmath=True, cache=True)
+def _rel_pos(r_x: float, r_y: float, orient: float, t_x: float, t_y: float) -> PolarVec2D:
+    distance = ((t_x - r_x)**2 + (t_y - r_y)**2)**0.5
+    angle = norm_angle(atan2(t_y - r_y, t_x - r_x) - orient)
+    return distance, angle
+
+
+@numba.njit(fastmath=True, cache=True)
+def _target_sensor_obs(
+        r_x: float, r_y: float, orient: float, g_x: float, g_y: float,
+        next_goal_orient: float, has_next_goal: bool) -> Tuple[float, float, float]:
+    target_distance = ((g_x - r_x)**2 + (g_y - r_y)**2)**0.5
+    goal_orient = atan2(g_y - r_y, g_x - r_x)
+    target_angle = norm_angle(goal_orient - orient)
+    next_target_angle = norm_angle(next_goal_orient - goal_orient) if has_next_goal else 0.0
+    return target_distance, target_angle, next_target_angle
+
+
 def angle(p_1: Vec2D, p_2: Vec2D, p_3: Vec2D) -> float:
     """Compute the difference between the linear projection of a vehicle at p1
     moving straight towards the goal p2 and the straight trajectory from p2
     towards the next goal p3. For a smooth trajectory, the driving agent
     has to steer such that the angle is about 0."""
-
-    v1_x, v1_y = p_2[0] - p_1[0], p_2[1] - p_1[1]
-    v2_x, v2_y = p_3[0] - p_2[0], p_3[1] - p_2[1]
-    o_1, o_2 = atan2(v1_y, v1_x), atan2(v2_y, v2_x)
-    return norm_angle(o_2 - o_1)
+    return _angle(float(p_1[0]), float(p_1[1]), float(p_2[0]),
+                  float(p_2[1]), float(p_3[0]), float(p_3[1]))
 
 
 def rel_pos(pose: RobotPose, target_coords: Vec2D) -> PolarVec2D:
-    t_x, t_y = target_coords
     (r_x, r_y), orient = pose
-    distance = dist(target_coords, (r_x, r_y))
-    angle = norm_angle(atan2(t_y - r_y, t_x - r_x) - orient)
-    return distance, angle
+    return _rel_pos(float(r_x), float(r_y), float(orient),
+                    float(target_coords[0]), float(target_coords[1]))
 
 
 def target_sensor_obs(
         robot_pose: RobotPose,
         goal_pos: Vec2D,
-        next_goal_pos: Union[Vec2D, None]) -> Tuple[float, float, float]:
-    robot_pos, _ = robot_pose
-    target_distance, target_angle = rel_pos(robot_pose, goal_pos)
-    next_target_angle = angle(robot_pos, goal_pos, next_goal_pos) \
-        if next_goal_pos is not None else 0.0
-    return target_distance, target_angle, next_target_angle
+        next_goal_pos: Union[Vec2D, None],
+        next_goal_orient: Optional[float]=None) -> Tuple[float, float, float]:
+    """Observe the distance and angle towards the goal and the angle between
+    the robot's line of sight to the goal and the route segment towards the
+    next goal. The route segment's orientation only depends on the waypoints,
+    so it can be passed in precomputed as next_goal_orient."""
+    # info: the jitted kernel takes plain floats to avoid the costly dispatch of tuples
+    (r_x, r_y), orient = robot_pose
+    has_next_goal = next_goal_pos is not None
+    if has_next_goal and next_goal_orient is None:
+        next_goal_orient = atan2(next_goal_pos[1] - goal_pos[1], next_goal_pos[0] - goal_pos[0])
+    next_goal_orient = next_goal_orient if has_next_goal else 0.0
+    return _target_sensor_obs(
+        float(r_x), float(r_y), float(orient), float(goal_pos[0]),
+        float(goal_pos[1]), float(next_goal_orient), has_next_goal)
 
 
 def target_sensor_space(max_target_dist: float) -> spaces.Box:
@@ -19,12 +19,12 @@ Line2D = Tuple[Vec2D, Vec2D]
 Circle2D = Tuple[Vec2D, float]
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def euclid_dist(vec_1: Vec2D, vec_2: Vec2D) -> float:
     return ((vec_1[0] - vec_2[0])**2 + (vec_1[1] - vec_2[1])**2)**0.5
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def lineseg_line_intersection_distance(segment: Line2D, sensor_pos: Vec2D, ray_vec: Vec2D) -> float:
     (x_1, y_1), (x_2, y_2) = segment
     x_sensor, y_sensor = sensor_pos
@@ -49,7 +49,7 @@ def lineseg_line_intersection_distance(segment: Line2D, sensor_pos: Vec2D, ray_v
         return np.inf
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def circle_line_intersection_distance(circle: Circle2D, origin: Vec2D, ray_vec: Vec2D) -> float:
     (c_x, c_y), r = circle
     ray_x, ray_y = ray_vec
@@ -114,10 +114,10 @@ class LidarScannerSettings:
         self.angle_opening = (-np.pi * self.visual_angle_portion, np.pi * self.visual_angle_portion)
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def raycast_pedestrians(
         out_ranges: np.ndarray, scanner_pos: Vec2D, max_scan_range: float,
-        ped_positions: np.ndarray, ped_radius: float, ray_angles: np.ndarray):
+        ped_positions: np.ndarray, ped_radius: float, ray_vecs: np.ndarray):
 
     if len(ped_positions.shape) != 2 or ped_positions.shape[0] == 0 \
             or ped_positions.shape[1] != 2:
@@ -133,8 +133,8 @@ def raycast_pedestrians(
     if len(ped_dist_mask) == 0:
         return
 
-    for i, angle in enumerate(ray_angles):
-        unit_vec = cos(angle), sin(angle)
+    for i in range(ray_vecs.shape[0]):
+        unit_vec = ray_vecs[i, 0], ray_vecs[i, 1]
         cos_sims = close_ped_pos[:, 0] * unit_vec[0] \
             + close_ped_pos[:, 1] * unit_vec[1]
 
@@ -149,37 +149,69 @@ def raycast_pedestrians(
             out_ranges[i] = min(coll_dist, out_ranges[i])
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
+def obstacles_in_range(scanner_pos: Vec2D, max_scan_range: float, obstacles: np.ndarray) -> np.ndarray:
+    """Determine the indices of the obstacle segments whose closest point
+    lies within the scan range. Rays can only hit those segments
+    before exceeding the scan range."""
+    (p_x, p_y), range_sq = scanner_pos, max_scan_range**2
+    num_in_range, in_range = 0, np.empty((obstacles.shape[0]), dtype=np.int64)
+    for j in range(obstacles.shape[0]):
+        s_x, s_y, e_x, e_y = obstacles[j, 0], obstacles[j, 1], obstacles[j, 2], obstacles[j, 3]
+        seg_x, seg_y = e_x - s_x, e_y - s_y
+        seg_len_sq = seg_x**2 + seg_y**2
+        rel_pos = ((p_x - s_x) * seg_x + (p_y - s_y) * seg_y) / seg_len_sq if seg_len_sq > 0 else 0.0
+        rel_pos = min(max(rel_pos, 0.0), 1.0)
+        dist_sq = (s_x + rel_pos * seg_x - p_x)**2 + (s_y + rel_pos * seg_y - p_y)**2
+        if dist_sq <= range_sq:
+            in_range[num_in_range] = j
+            num_in_range += 1
+    return in_range[:num_in_range]
+
+
+@numba.njit(fastmath=True, cache=True)
 def raycast_obstacles(
-        out_ranges: np.ndarray, scanner_pos: Vec2D,
-        obstacles: np.ndarray, ray_angles: np.ndarray):
+        out_ranges: np.ndarray, scanner_pos: Vec2D, max_scan_range: float,
+        obstacles: np.ndarray, ray_vecs: np.ndarray):
 
     if len(obstacles.shape) != 2 or obstacles.shape[0] == 0 or obstacles.shape[1] != 4:
         return
 
-    for i, angle in enumerate(ray_angles):
-        unit_vec = cos(angle), sin(angle)
-        for s_x, s_y, e_x, e_y in obstacles:
-            obst_lineseg = ((s_x, s_y), (e_x, e_y))
+    # info: hits beyond the scan range are clipped anyway, so only the
+    #       segments within the scan range need to be tested by each ray
+    close_obstacle_ids = obstacles_in_range(scanner_pos, max_scan_range, obstacles)
+
+    # info: keep the current range in a register instead of
+    #       writing it back into the array for each obstacle
+    for i in range(ray_vecs.shape[0]):
+        unit_vec = ray_vecs[i, 0], ray_vecs[i, 1]
+        min_dist = out_ranges[i]
+        for j in close_obstacle_ids:
+            obst_lineseg = ((obstacles[j, 0], obstacles[j, 1]), (obstacles[j, 2], obstacles[j, 3]))
             coll_dist = lineseg_line_intersection_distance(obst_lineseg, scanner_pos, unit_vec)
-            out_ranges[i] = min(coll_dist, out_ranges[i])
+            min_dist = min(coll_dist, min_dist)
+        out_ranges[i] = min_dist
 
 
-@numba.njit()
+@numba.njit(cache=True)
 def raycast(scanner_pos: Vec2D, obstacles: np.ndarray, max_scan_range: float,
             ped_pos: np.ndarray, ped_radius: float, ray_angles: np.ndarray) -> np.ndarray:
     """Cast rays in the directions of all given angles outgoing from
     the scanner's position and detect the minimal collision distance
     with either a pedestrian or an obstacle (or in case there's no collision,
     just return the maximum scan range)."""
-    out_ranges = np.full((ray_angles.shape[0]), np.inf)
-    raycast_pedestrians(out_ranges, scanner_pos, max_scan_range, ped_pos, ped_radius, ray_angles)
-    raycast_obstacles(out_ranges, scanner_pos, obstacles, ray_angles)
+    # info: the ranges are used as float32 observations, so they're kept in float32 from the start
+    out_ranges = np.full((ray_angles.shape[0]), np.inf, dtype=np.float32)
+    ray_vecs = np.empty((ray_angles.shape[0], 2))
+    for i in range(ray_angles.shape[0]):
+        ray_vecs[i, 0], ray_vecs[i, 1] = cos(ray_angles[i]), sin(ray_angles[i])
+    raycast_pedestrians(out_ranges, scanner_pos, max_scan_range, ped_pos, ped_radius, ray_vecs)
+    raycast_obstacles(out_ranges, scanner_pos, max_scan_range, obstacles, ray_vecs)
     # TODO: add raycast for other robots
     return out_ranges
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
 def range_postprocessing(out_ranges: np.ndarray, scan_noise: np.ndarray, max_scan_dist: float):
     """Postprocess the raycast results to simulate a noisy scan result."""
     prob_scan_loss, prob_scan_corruption = scan_noise
@@ -211,7 +243,7 @@ def lidar_ray_scan(
     lower = robot_orient + settings.angle_opening[0]
     upper = robot_orient + settings.angle_opening[1]
     ray_angles = np.linspace(lower, upper, settings.num_rays + 1)[:-1]
-    ray_angles = np.array([(angle + np.pi*2) % (np.pi*2) for angle in ray_angles])
+    ray_angles = (ray_angles + np.pi*2) % (np.pi*2)
 
     ranges = raycast(
         (pos_x, pos_y), obstacles, scan_dist, ped_pos,
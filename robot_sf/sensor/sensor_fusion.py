@@ -1,4 +1,4 @@
-from typing import Tuple, Callable, List, Dict
+from typing import Tuple, Callable, Dict
 from dataclasses import dataclass, field
 
 import numpy as np
@@ -14,27 +14,27 @@ def fused_sensor_space(
         timesteps: int, robot_obs: spaces.Box,
         target_obs: spaces.Box, lidar_obs: spaces.Box
     ) -> Tuple[spaces.Dict, spaces.Dict]:
-    max_drive_state = np.array([
-        robot_obs.high.tolist() + target_obs.high.tolist()
-        for t in range(timesteps)], dtype=np.float32)
-    min_drive_state = np.array([
-        robot_obs.low.tolist() + target_obs.low.tolist()
-        for t in range(timesteps)], dtype=np.float32)
-    max_lidar_state = np.array([lidar_obs.high.tolist() for t in range(timesteps)], dtype=np.float32)
-    min_lidar_state = np.array([lidar_obs.low.tolist() for t in range(timesteps)], dtype=np.float32)
+    def stack_bounds(*bounds: np.ndarray) -> np.ndarray:
+        return np.tile(np.concatenate(bounds).astype(np.float32), (timesteps, 1))
+
+    max_drive_state = stack_bounds(robot_obs.high, target_obs.high)
+    min_drive_state = stack_bounds(robot_obs.low, target_obs.low)
+    max_lidar_state = stack_bounds(lidar_obs.high)
+    min_lidar_state = stack_bounds(lidar_obs.low)
 
     orig_box_drive_state = spaces.Box(low=min_drive_state, high=max_drive_state, dtype=np.float32)
     orig_box_lidar_state = spaces.Box(low=min_lidar_state, high=max_lidar_state, dtype=np.float32)
     orig_obs_space = spaces.Dict({ OBS_DRIVE_STATE: orig_box_drive_state, OBS_RAYS: orig_box_lidar_state })
 
-    box_drive_state = spaces.Box(
-        low=min_drive_state / max_drive_state,
-        high=max_drive_state / max_drive_state,
-        dtype=np.float32)
-    box_lidar_state = spaces.Box(
-        low=min_lidar_state / max_lidar_state,
-        high=max_lidar_state / max_lidar_state,
-        dtype=np.float32)
+    def norm_bounds(low: np.ndarray, high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # info: avoid 0 / 0 divisions for upper bounds of zero
+        norm_low = np.divide(low, high, out=np.zeros_like(low), where=high != 0)
+        return norm_low, np.ones_like(high)
+
+    drive_low, drive_high = norm_bounds(min_drive_state, max_drive_state)
+    lidar_low, lidar_high = norm_bounds(min_lidar_state, max_lidar_state)
+    box_drive_state = spaces.Box(low=drive_low, high=drive_high, dtype=np.float32)
+    box_lidar_state = spaces.Box(low=lidar_low, high=lidar_high, dtype=np.float32)
     norm_obs_space = spaces.Dict({ OBS_DRIVE_STATE: box_drive_state, OBS_RAYS: box_lidar_state })
 
     return norm_obs_space, orig_obs_space
@@ -47,12 +47,24 @@ class SensorFusion:
     target_sensor: Callable[[], Tuple[float, float, float]]
     unnormed_obs_space: spaces.Dict
     use_next_goal: bool
-    drive_state_cache: List[np.ndarray] = field(init=False, default_factory=list)
-    lidar_state_cache: List[np.ndarray] = field(init=False, default_factory=list)
+    drive_state_cache: np.ndarray = field(init=False)
+    lidar_state_cache: np.ndarray = field(init=False)
     cache_steps: int = field(init=False)
+    cache_head: int = field(init=False, default=0)
+    is_cache_empty: bool = field(init=False, default=True)
+    inv_max_drive_state: np.ndarray = field(init=False)
+    inv_max_lidar_state: np.ndarray = field(init=False)
 
     def __post_init__(self):
+        # info: the caches are ring buffers, cache_head points to the oldest state
         self.cache_steps = self.unnormed_obs_space[OBS_RAYS].shape[0]
+        self.drive_state_cache = np.zeros(self.unnormed_obs_space[OBS_DRIVE_STATE].shape, dtype=np.float32)
+        self.lidar_state_cache = np.zeros(self.unnormed_obs_space[OBS_RAYS].shape, dtype=np.float32)
+        # info: normalize by multiplying with the reciprocals of the max. values
+        self.inv_max_drive_state = np.ascontiguousarray(
+            1 / self.unnormed_obs_space[OBS_DRIVE_STATE].high, dtype=np.float32)
+        self.inv_max_lidar_state = np.ascontiguousarray(
+            1 / self.unnormed_obs_space[OBS_RAYS].high, dtype=np.float32)
 
     def next_obs(self) -> Dict[str, np.ndarray]:
         lidar_state = self.lidar_sensor()
@@ -61,27 +73,27 @@ class SensorFusion:
         speed_x, speed_rot = self.robot_speed_sensor()
         target_distance, target_angle, next_target_angle = self.target_sensor()
         next_target_angle = next_target_angle if self.use_next_goal else 0.0
-        drive_state = np.array([speed_x, speed_rot, target_distance, target_angle, next_target_angle])
+        drive_state = (speed_x, speed_rot, target_distance, target_angle, next_target_angle)
 
         # info: populate cache with same states -> no movement
-        if len(self.drive_state_cache) == 0:
-            for _ in range(self.cache_steps):
-                self.drive_state_cache.append(drive_state)
-                self.lidar_state_cache.append(lidar_state)
+        if self.is_cache_empty:
+            self.drive_state_cache[:] = drive_state
+            self.lidar_state_cache[:] = lidar_state
+            self.is_cache_empty = False
 
-        self.drive_state_cache.append(drive_state)
-        self.lidar_state_cache.append(lidar_state)
-        self.drive_state_cache.pop(0)
-        self.lidar_state_cache.pop(0)
+        self.drive_state_cache[self.cache_head] = drive_state
+        self.lidar_state_cache[self.cache_head] = lidar_state
+        self.cache_head = (self.cache_head + 1) % self.cache_steps
 
-        stacked_drive_state = np.array(self.drive_state_cache, dtype=np.float32)
-        stacked_lidar_state = np.array(self.lidar_state_cache, dtype=np.float32)
+        head = self.cache_head
+        stacked_drive_state = np.concatenate((self.drive_state_cache[head:], self.drive_state_cache[:head]))
+        stacked_lidar_state = np.concatenate((self.lidar_state_cache[head:], self.lidar_state_cache[:head]))
 
-        max_drive = self.unnormed_obs_space[OBS_DRIVE_STATE].high
-        max_lidar = self.unnormed_obs_space[OBS_RAYS].high
-        return { OBS_DRIVE_STATE: stacked_drive_state / max_drive,
-                 OBS_RAYS: stacked_lidar_state / max_lidar }
+        np.multiply(stacked_drive_state, self.inv_max_drive_state, out=stacked_drive_state)
+        np.multiply(stacked_lidar_state, self.inv_max_lidar_state, out=stacked_lidar_state)
+        return { OBS_DRIVE_STATE: stacked_drive_state,
+                 OBS_RAYS: stacked_lidar_state }
 
     def reset_cache(self):
-        self.drive_state_cache.clear()
-        self.lidar_state_cache.clear()
+        self.cache_head = 0
+        self.is_cache_empty = True
@@ -1,6 +1,6 @@
 from time import sleep
-from math import sin, cos
-from typing import Tuple, Union, List
+from math import sin, cos, ceil
+from typing import Tuple, Union, List, Dict
 from dataclasses import dataclass, field
 from threading import Thread
 from signal import signal, SIGINT
@@ -32,6 +32,7 @@ PED_ACTION_COLOR = (255, 50, 50)
 ROBOT_GOAL_COLOR = (0, 204, 102)
 ROBOT_LIDAR_COLOR = (238, 160, 238, 128)
 TEXT_COLOR = (0, 0, 0)
+SPRITE_COLORKEY = (0, 0, 0) # transparent sprite background, mustn't be used as color
 
 
 @dataclass
@@ -53,6 +54,12 @@ class VisualizableSimState:
     ped_actions: np.ndarray
     # obstacles: List[Obstacle]
 
+    def __post_init__(self):
+        # info: the camera transforms run in float32, like the rest of the observations
+        self.pedestrian_positions = self.pedestrian_positions.astype(np.float32, copy=False)
+        self.ray_vecs = self.ray_vecs.astype(np.float32, copy=False)
+        self.ped_actions = self.ped_actions.astype(np.float32, copy=False)
+
 
 @dataclass
 class SimulationView:
@@ -68,6 +75,8 @@ class SimulationView:
     is_abortion_requested: bool = field(init=False, default=False)
     screen: pygame.surface.Surface = field(init=False)
     font: pygame.font.Font = field(init=False)
+    circle_sprites: Dict[Tuple[RgbColor, float], pygame.Surface] = field(init=False, default_factory=dict)
+    circle_sprites_scaling: float = field(init=False, default=0.0)
 
     @property
     def timestep_text_pos(self) -> Vec2D:
@@ -84,16 +93,17 @@ class SimulationView:
         self.clear()
 
     def preprocess_obstacles(self) -> pygame.Surface:
+        if not self.obstacles:
+            return pygame.Surface((0, 0), pygame.SRCALPHA)
+
         obst_vertices = [o.vertices_np * self.scaling for o in self.obstacles]
-        min_x, max_x, min_y, max_y = np.inf, -np.inf, np.inf, -np.inf
-        for vertices in obst_vertices:
-            min_x, max_x = min(np.min(vertices[:, 0]), min_x), max(np.max(vertices[:, 0]), max_x)
-            min_y, max_y = min(np.min(vertices[:, 1]), min_y), max(np.max(vertices[:, 1]), max_y)
+        all_vertices = np.concatenate(obst_vertices)
+        (min_x, min_y), (max_x, max_y) = np.min(all_vertices, axis=0), np.max(all_vertices, axis=0)
         width, height = max_x - min_x, max_y - min_y
         surface = pygame.Surface((width, height), pygame.SRCALPHA)
         surface.fill(BACKGROUND_COLOR_TRANSP)
         for vertices in obst_vertices:
-            pygame.draw.polygon(surface, OBSTACLE_COLOR, [(x, y) for x, y in vertices])
+            pygame.draw.polygon(surface, OBSTACLE_COLOR, vertices.tolist())
         return surface
 
     def show(self):
@@ -111,15 +121,16 @@ class SimulationView:
         self.ui_events_thread.join()
 
     def _process_event_queue(self):
+        # info: block on the event queue instead of polling, the timeout
+        #       ensures that an exit request is noticed within 10 ms
         while not self.is_exit_requested:
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    self.is_exit_requested = True
-                    self.is_abortion_requested = True
-                elif e.type == pygame.VIDEORESIZE:
-                    self.size_changed = True
-                    self.width, self.height = e.w, e.h
-            sleep(0.01)
+            e = pygame.event.wait(timeout=10)
+            if e.type == pygame.QUIT:
+                self.is_exit_requested = True
+                self.is_abortion_requested = True
+            elif e.type == pygame.VIDEORESIZE:
+                self.size_changed = True
+                self.width, self.height = e.w, e.h
 
     def clear(self):
         self.screen.fill(BACKGROUND_COLOR)
@@ -164,12 +175,10 @@ class SimulationView:
         r_x, r_y = state.robot_pose[0]
         x_offset = r_x * self.scaling - self.width / 2
         y_offset = r_y * self.scaling - self.height / 2
-        state.pedestrian_positions *= self.scaling
-        state.pedestrian_positions -= [x_offset, y_offset]
-        state.ped_actions *= self.scaling
-        state.ped_actions -= [x_offset, y_offset]
-        state.ray_vecs *= self.scaling
-        state.ray_vecs -= [x_offset, y_offset]
+        scaling, offset = np.float32(self.scaling), np.array([x_offset, y_offset], dtype=np.float32)
+        for points in (state.pedestrian_positions, state.ped_actions, state.ray_vecs):
+            points *= scaling
+            points -= offset
         state.robot_pose = ((
             state.robot_pose[0][0] * self.scaling - x_offset,
             state.robot_pose[0][1] * self.scaling - y_offset),
@@ -186,12 +195,32 @@ class SimulationView:
 
     def _draw_robot(self, pose: RobotPose):
         # TODO: display robot with an image instead of a circle
-        pygame.draw.circle(self.screen, ROBOT_COLOR, pose[0], self.robot_radius * self.scaling)
+        self._draw_circles(ROBOT_COLOR, [pose[0]], self.robot_radius * self.scaling)
 
     def _draw_pedestrians(self, ped_pos: np.ndarray):
         # TODO: display pedestrians with an image instead of a circle
-        for ped_x, ped_y in ped_pos:
-            pygame.draw.circle(self.screen, PED_COLOR, (ped_x, ped_y), self.ped_radius * self.scaling)
+        self._draw_circles(PED_COLOR, ped_pos.tolist(), self.ped_radius * self.scaling)
+
+    def _draw_circles(self, color: RgbColor, centers: List[Vec2D], radius: float):
+        sprite = self._circle_sprite(color, radius)
+        r_px = sprite.get_width() // 2
+        self.screen.blits([(sprite, (x - r_px, y - r_px)) for x, y in centers], doreturn=False)
+
+    def _circle_sprite(self, color: RgbColor, radius: float) -> pygame.Surface:
+        # info: circles are rasterized once and blitted afterwards,
+        #       the sprites of the previous scaling are dropped when the scaling changes
+        if self.scaling != self.circle_sprites_scaling:
+            self.circle_sprites.clear()
+            self.circle_sprites_scaling = self.scaling
+        key = (color, radius)
+        if key not in self.circle_sprites:
+            r_px = ceil(radius)
+            sprite = pygame.Surface((2 * r_px + 1, 2 * r_px + 1))
+            sprite.fill(SPRITE_COLORKEY)
+            sprite.set_colorkey(SPRITE_COLORKEY)
+            pygame.draw.circle(sprite, color, (r_px, r_px), radius)
+            self.circle_sprites[key] = sprite.convert()
+        return self.circle_sprites[key]
 
     def _draw_obstacles(self, offset: Tuple[float, float]):
         offset = offset[0] * -1, offset[1] * -1
@@ -199,27 +228,22 @@ class SimulationView:
 
     def _augment_goal_position(self, robot_goal: Vec2D):
         # TODO: display pedestrians with an image instead of a circle
-        pygame.draw.circle(self.screen, ROBOT_GOAL_COLOR, robot_goal, self.goal_radius * self.scaling)
+        self._draw_circles(ROBOT_GOAL_COLOR, [robot_goal], self.goal_radius * self.scaling)
 
     def _augment_lidar(self, ray_vecs: np.ndarray):
-        for p1, p2 in ray_vecs:
+        # info: converting all segments at once is cheaper than
+        #       having pygame convert each of the NumPy points
+        for p1, p2 in ray_vecs.tolist():
             pygame.draw.line(self.screen, ROBOT_LIDAR_COLOR, p1, p2)
 
     def _augment_robot_action(self, action: VisualizableAction):
         r_x, r_y = action.robot_pose[0]
         vec_length, vec_orient = action.robot_action[0] * self.scaling * 3, action.robot_pose[1]
-
-        def from_polar(length: float, orient: float) -> Vec2D:
-            return cos(orient) * length, sin(orient) * length
-
-        def add_vec(v_1: Vec2D, v_2: Vec2D) -> Vec2D:
-            return v_1[0] + v_2[0], v_1[1] + v_2[1]
-
-        vec_x, vec_y = add_vec((r_x, r_y), from_polar(vec_length, vec_orient))
+        vec_x, vec_y = r_x + cos(vec_orient) * vec_length, r_y + sin(vec_orient) * vec_length
         pygame.draw.line(self.screen, ROBOT_ACTION_COLOR, (r_x, r_y), (vec_x, vec_y), width=3)
 
     def _augment_ped_actions(self, ped_actions: np.ndarray):
-        for p1, p2 in ped_actions:
+        for p1, p2 in ped_actions.tolist():
             pygame.draw.line(self.screen, PED_ACTION_COLOR, p1, p2, width=3)
 
     def _augment_timestep(self, timestep: int):
@@ -50,7 +50,8 @@ class Simulator:
             if self.config.prf_config.is_active:
                 for robot in self.robots:
                     self.config.prf_config.robot_radius = robot.config.radius
-                    forces.append(PedRobotForce(self.config.prf_config, sim.peds, lambda: robot.pos))
+                    forces.append(PedRobotForce(
+                        self.config.prf_config, sim.peds, lambda robot=robot: robot.pos))
             return forces
 
         self.pysf_sim = PySFSimulator(
@@ -1,51 +1,108 @@
-from typing import Optional, List
+from queue import SimpleQueue
+from threading import Thread
+from typing import Optional, List, Callable, Dict
 
 from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.logger import TensorBoardOutputFormat, SummaryWriter
+from tensorboard.compat.proto.summary_pb2 import Summary
 
-from robot_sf.eval import EnvMetrics, VecEnvMetrics
+from robot_sf.eval import VecEnvMetrics
 
 
 class DrivingMetricsCallback(BaseCallback):
 
-    def __init__(self, num_envs: int):
+    def __init__(self, num_envs: int, log_freq: int=1000):
         super(DrivingMetricsCallback, self).__init__()
+        self._log_freq = log_freq
+        self._log_countdown = log_freq
         self.writer: Optional[SummaryWriter] = None
-        self.metrics = VecEnvMetrics([EnvMetrics() for _ in range(num_envs)])
-
-    @property
-    def meta_dicts(self) -> List[dict]:
-        return [m["meta"] for m in self.locals["infos"]]
-
-    @property
-    def is_logging_step(self) -> bool:
-        return self.n_calls % self._log_freq == 0
+        self.add_summary: Optional[Callable[[Summary, int], None]] = None
+        self.metrics = VecEnvMetrics(num_envs)
+        self.pending_infos: List[List[dict]] = []
+        self.metrics_queue: SimpleQueue = SimpleQueue()
+        self.metrics_thread: Optional[Thread] = None
+        self.metrics_error: Optional[BaseException] = None
 
     def _on_training_start(self):
-        self._log_freq = 1000  # log every 1000 calls
+        self._log_countdown = self._log_freq - self.n_calls % self._log_freq
 
         if self.logger is not None:
-            output_formats = self.logger.output_formats
-            tb_formatter: TensorBoardOutputFormat = next(
-                filter(lambda f: isinstance(f, TensorBoardOutputFormat), output_formats), None)
+            tb_formatter: Optional[TensorBoardOutputFormat] = next(
+                (f for f in self.logger.output_formats if isinstance(f, TensorBoardOutputFormat)), None)
             self.writer = tb_formatter.writer if tb_formatter else None
 
         if self.writer is None:
             print("WARNING: failed to initialize tensorboard environment metrics!")
+        else:
+            # info: resolve the file writer once instead of on each logging step
+            self.add_summary = self.writer._get_file_writer().add_summary
+
+        self.metrics_thread = Thread(target=self._process_metrics, daemon=True)
+        self.metrics_thread.start()
 
     def _on_step(self) -> bool:
-        self.metrics.update(self.meta_dicts)
-
-        if self.writer is not None and self.is_logging_step:
-            self.writer.add_scalar("metrics/route_completion_rate",
-                                   self.metrics.route_completion_rate, self.num_timesteps)
-            self.writer.add_scalar("metrics/interm_goal_completion_rate",
-                                   self.metrics.interm_goal_completion_rate, self.num_timesteps)
-            self.writer.add_scalar("metrics/timeout_rate",
-                                   self.metrics.timeout_rate, self.num_timesteps)
-            self.writer.add_scalar("metrics/obstacle_collision_rate",
-                                   self.metrics.obstacle_collision_rate, self.num_timesteps)
-            self.writer.add_scalar("metrics/pedestrian_collision_rate",
-                                   self.metrics.pedestrian_collision_rate, self.num_timesteps)
-            self.writer.flush()
+        # info: the metrics are only read on logging steps, so the infos are
+        #       buffered and evaluated in a single batch once per logging step
+        self.pending_infos.append(self.locals["infos"])
+        # info: count down to the next logging step instead of a modulo on each call
+        self._log_countdown -= 1
+        if self._log_countdown > 0:
+            return True
+        self._log_countdown = self._log_freq
+
+        self._flush_metrics()
         return True # info: don't request early abort
+
+    def _on_training_end(self):
+        # info: don't lose the infos of the last partial logging interval
+        if self.pending_infos:
+            self._flush_metrics()
+        self.metrics_queue.put(None)
+        self.metrics_thread.join()
+        self._raise_metrics_error()
+
+    def _flush_metrics(self):
+        # info: the metrics are updated on the training thread, so callbacks reading
+        #       them on the same logging step (e.g. in hparam_opt.py) see current values
+        for infos in self.pending_infos:
+            self.metrics.update([info["meta"] for info in infos])
+        self.pending_infos = []
+
+        self._raise_metrics_error()
+        if self.add_summary is not None:
+            # info: hand an immutable snapshot of the rates over to the metrics thread,
+            #       so the summary is written while the training thread waits for the envs
+            self.metrics_queue.put((self._metrics_snapshot(), self.num_timesteps))
+
+    def _metrics_snapshot(self) -> Dict[str, float]:
+        return {
+            "route_completion_rate": self.metrics.route_completion_rate,
+            "interm_goal_completion_rate": self.metrics.interm_goal_completion_rate,
+            "timeout_rate": self.metrics.timeout_rate,
+            "obstacle_collision_rate": self.metrics.obstacle_collision_rate,
+            "pedestrian_collision_rate": self.metrics.pedestrian_collision_rate
+        }
+
+    def _raise_metrics_error(self):
+        if self.metrics_error is not None:
+            error, self.metrics_error = self.metrics_error, None
+            raise RuntimeError("failed to write the tensorboard environment metrics!") from error
+
+    def _process_metrics(self):
+        while True:
+            batch = self.metrics_queue.get()
+            if batch is None:
+                break
+            try:
+                self._write_metrics(*batch)
+            except BaseException as error:
+                # info: keep the error for the training thread to re-raise it
+                self.metrics_error = error
+                break
+
+    def _write_metrics(self, scalars: Dict[str, float], num_timesteps: int):
+        # info: write all metrics as a single summary event and leave
+        #       the flushing to the writer's buffered flush interval
+        summary = Summary(value=[Summary.Value(tag=f"metrics/{tag}", simple_value=value)
+                                 for tag, value in scalars.items()])
+        self.add_summary(summary, num_timesteps)
@@ -0,0 +1,305 @@
+import multiprocessing as mp
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import gym
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import \
+    CloudpickleWrapper, VecEnv, VecEnvIndices, VecEnvObs, VecEnvStepReturn
+from stable_baselines3.common.vec_env.subproc_vec_env import _flatten_obs
+
+
+# info: layout of a shared buffer as (shared memory name, shape, dtype)
+BufferLayout = Tuple[str, Tuple[int, ...], str]
+
+
+@dataclass
+class SharedStepBuffers:
+    """Representing the observations, rewards and dones of a range of
+    environments as array views onto shared memory blocks. The observations
+    are keyed by the observation space's keys (or None for a Box space)."""
+    shared_mems: List[SharedMemory]
+    obs: Dict[Optional[str], np.ndarray]
+    rewards: np.ndarray
+    dones: np.ndarray
+
+    @staticmethod
+    def create(obs_space: gym.Space, num_envs: int) -> "SharedStepBuffers":
+        if isinstance(obs_space, gym.spaces.Box):
+            obs_spaces = { None: obs_space }
+        elif isinstance(obs_space, gym.spaces.Dict) \
+                and all(isinstance(s, gym.spaces.Box) for s in obs_space.spaces.values()):
+            obs_spaces = obs_space.spaces
+        else:
+            raise ValueError(f"unsupported observation space {obs_space} for shared memory!")
+
+        layouts = [(key, (num_envs, *space.shape), space.dtype) for key, space in obs_spaces.items()]
+        layouts += [("rewards", (num_envs,), np.float64), ("dones", (num_envs,), np.bool_)]
+        shared_mems = [SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+                       for _, shape, dtype in layouts]
+        arrays = [np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                  for (_, shape, dtype), shm in zip(layouts, shared_mems)]
+        return SharedStepBuffers(shared_mems, dict(zip(obs_spaces.keys(), arrays[:-2])), arrays[-2], arrays[-1])
+
+    @property
+    def layout(self) -> Dict[Optional[str], BufferLayout]:
+        arrays = { **self.obs, "rewards": self.rewards, "dones": self.dones }
+        return { key: (shm.name, arr.shape, arr.dtype.str)
+                 for (key, arr), shm in zip(arrays.items(), self.shared_mems) }
+
+    @staticmethod
+    def attach(layout: Dict[Optional[str], BufferLayout], env_slice: slice) -> "SharedStepBuffers":
+        shared_mems = [SharedMemory(name=name) for name, _, _ in layout.values()]
+        arrays = { key: np.ndarray(shape, dtype=dtype, buffer=shm.buf)[env_slice]
+                   for (key, (_, shape, dtype)), shm in zip(layout.items(), shared_mems) }
+        rewards, dones = arrays.pop("rewards"), arrays.pop("dones")
+        return SharedStepBuffers(shared_mems, arrays, rewards, dones)
+
+    def write_obs(self, all_obs: List[Any]):
+        for i, obs in enumerate(all_obs):
+            for key, buffer in self.obs.items():
+                buffer[i] = obs if key is None else obs[key]
+
+    def read_obs(self) -> VecEnvObs:
+        # info: the buffers get overwritten by the next step, so the caller receives copies
+        if None in self.obs:
+            return self.obs[None].copy()
+        return OrderedDict([(key, buffer.copy()) for key, buffer in self.obs.items()])
+
+    def close(self, unlink: bool=False):
+        self.obs, self.rewards, self.dones = {}, None, None
+        for shm in self.shared_mems:
+            shm.close()
+            if unlink:
+                shm.unlink()
+
+
+def _worker(
+        remote: mp.connection.Connection, parent_remote: mp.connection.Connection,
+        env_fns_wrapper: CloudpickleWrapper):
+    # info: import here to avoid a circular import
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    envs: List[gym.Env] = [env_fn() for env_fn in env_fns_wrapper.var]
+    shared_buffers: Optional[SharedStepBuffers] = None
+
+    def step(env: gym.Env, action: np.ndarray):
+        obs, reward, done, info = env.step(action)
+        if done:
+            info["terminal_observation"] = obs
+            obs = env.reset()
+        return obs, reward, done, info
+
+    while True:
+        try:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                remote.send([step(env, action) for env, action in zip(envs, data)])
+            elif cmd == "step_shared":
+                results = [step(env, action) for env, action in zip(envs, data)]
+                shared_buffers.write_obs([obs for obs, _, _, _ in results])
+                for i, (_, reward, done, _) in enumerate(results):
+                    shared_buffers.rewards[i], shared_buffers.dones[i] = reward, done
+                remote.send([info for _, _, _, info in results])
+            elif cmd == "reset_shared":
+                shared_buffers.write_obs([env.reset() for env in envs])
+                remote.send(None)
+            elif cmd == "attach_shared_memory":
+                shared_buffers = SharedStepBuffers.attach(*data)
+                remote.send(None)
+            elif cmd == "seed":
+                remote.send([env.seed(data + i) for i, env in enumerate(envs)])
+            elif cmd == "reset":
+                remote.send([env.reset() for env in envs])
+            elif cmd == "render":
+                remote.send([env.render(data) for env in envs])
+            elif cmd == "close":
+                for env in envs:
+                    env.close()
+                if shared_buffers is not None:
+                    shared_buffers.close()
+                remote.close()
+                break
+            elif cmd == "get_spaces":
+                remote.send((envs[0].observation_space, envs[0].action_space))
+            elif cmd == "env_method":
+                method_name, args, kwargs, env_ids = data
+                remote.send([getattr(envs[i], method_name)(*args, **kwargs) for i in env_ids])
+            elif cmd == "get_attr":
+                attr_name, env_ids = data
+                remote.send([getattr(envs[i], attr_name) for i in env_ids])
+            elif cmd == "set_attr":
+                attr_name, value, env_ids = data
+                remote.send([setattr(envs[i], attr_name, value) for i in env_ids])
+            elif cmd == "is_wrapped":
+                wrapper_class, env_ids = data
+                remote.send([is_wrapped(envs[i], wrapper_class) for i in env_ids])
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+        except EOFError:
+            break
+
+
+class BatchedSubprocVecEnv(VecEnv):
+    """Representing a multiprocess vectorized environment that runs a batch of
+    environments per worker process, e.g. 64 environments on 16 workers.
+
+    Each step costs a single pipe round trip per worker instead of per environment
+    and the variance of the step times averages out within a worker's batch,
+    so the trainer waits less for the slowest worker."""
+
+    def __init__(
+            self, env_fns: List[Callable[[], gym.Env]],
+            envs_per_worker: int = 4, start_method: Optional[str] = None):
+        if envs_per_worker <= 0:
+            raise ValueError("Amount of environments per worker mustn't be negative or zero!")
+
+        self.waiting = False
+        self.closed = False
+        n_envs = len(env_fns)
+        self.worker_slices = [slice(start, min(start + envs_per_worker, n_envs))
+                              for start in range(0, n_envs, envs_per_worker)]
+
+        if start_method is None:
+            forkserver_available = "forkserver" in mp.get_all_start_methods()
+            start_method = "forkserver" if forkserver_available else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in self.worker_slices])
+        self.processes = []
+        for work_remote, remote, env_slice in zip(self.work_remotes, self.remotes, self.worker_slices):
+            args = (work_remote, remote, CloudpickleWrapper(env_fns[env_slice]))
+            # info: daemon processes don't keep a crashed main process hanging
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        self.remotes[0].send(("get_spaces", None))
+        observation_space, action_space = self.remotes[0].recv()
+        VecEnv.__init__(self, n_envs, observation_space, action_space)
+
+    def step_async(self, actions: np.ndarray):
+        for remote, env_slice in zip(self.remotes, self.worker_slices):
+            remote.send(("step", actions[env_slice]))
+        self.waiting = True
+
+    def step_wait(self) -> VecEnvStepReturn:
+        results = self._recv_all()
+        self.waiting = False
+        obs, rews, dones, infos = zip(*results)
+        return _flatten_obs(obs, self.observation_space), np.stack(rews), np.stack(dones), infos
+
+    def seed(self, seed: Optional[int] = None) -> List[Union[None, int]]:
+        if seed is None:
+            seed = np.random.randint(0, 2**32 - 1)
+        for remote, env_slice in zip(self.remotes, self.worker_slices):
+            remote.send(("seed", seed + env_slice.start))
+        return self._recv_all()
+
+    def reset(self) -> VecEnvObs:
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        return _flatten_obs(self._recv_all(), self.observation_space)
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:
+            self._recv_all()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def get_images(self) -> Sequence[np.ndarray]:
+        for remote in self.remotes:
+            remote.send(("render", "rgb_array"))
+        return self._recv_all()
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        return self._call_workers(lambda env_ids: ("get_attr", (attr_name, env_ids)), indices)
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None):
+        self._call_workers(lambda env_ids: ("set_attr", (attr_name, value, env_ids)), indices)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> List[Any]:
+        return self._call_workers(
+            lambda env_ids: ("env_method", (method_name, method_args, method_kwargs, env_ids)), indices)
+
+    def env_is_wrapped(self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None) -> List[bool]:
+        return self._call_workers(lambda env_ids: ("is_wrapped", (wrapper_class, env_ids)), indices)
+
+    def _recv_all(self) -> List[Any]:
+        # info: each worker responds with a list of results, one per environment
+        return [result for remote in self.remotes for result in remote.recv()]
+
+    def _call_workers(self, command: Callable[[List[int]], Tuple[str, Any]], indices: VecEnvIndices) -> List[Any]:
+        """Send the command to the workers hosting the given environments
+        and return the results in the order of the given indices."""
+        indices = list(self._get_indices(indices))
+        target_workers = []
+        for remote, env_slice in zip(self.remotes, self.worker_slices):
+            env_ids = [i - env_slice.start for i in indices if env_slice.start <= i < env_slice.stop]
+            if env_ids:
+                remote.send(command(env_ids))
+                target_workers.append((remote, env_slice.start, env_ids))
+
+        results_by_env = {}
+        for remote, offset, env_ids in target_workers:
+            for env_id, result in zip(env_ids, remote.recv()):
+                results_by_env[offset + env_id] = result
+        return [results_by_env[i] for i in indices]
+
+
+class SharedMemoryVecEnv(BatchedSubprocVecEnv):
+    """Representing a batched multiprocess vectorized environment whose workers
+    write the observations, rewards and dones into shared memory instead of
+    pickling them through the pipes. Only the infos are sent through the pipes,
+    so the step's pipe messages also signal that the shared buffers are ready."""
+
+    def __init__(
+            self, env_fns: List[Callable[[], gym.Env]],
+            envs_per_worker: int = 4, start_method: Optional[str] = None):
+        # info: start the resource tracker before the workers, so that all processes
+        #       share it; otherwise a worker's own tracker would unlink the shared
+        #       memory when the worker exits with the memory still being attached
+        resource_tracker.ensure_running()
+        super(SharedMemoryVecEnv, self).__init__(env_fns, envs_per_worker, start_method)
+        self.shared_buffers = SharedStepBuffers.create(self.observation_space, self.num_envs)
+        layout = self.shared_buffers.layout
+        for remote, env_slice in zip(self.remotes, self.worker_slices):
+            remote.send(("attach_shared_memory", (layout, env_slice)))
+        self._recv_all_none()
+
+    def step_async(self, actions: np.ndarray):
+        for remote, env_slice in zip(self.remotes, self.worker_slices):
+            remote.send(("step_shared", actions[env_slice]))
+        self.waiting = True
+
+    def step_wait(self) -> VecEnvStepReturn:
+        infos = self._recv_all()
+        self.waiting = False
+        buffers = self.shared_buffers
+        return buffers.read_obs(), buffers.rewards.copy(), buffers.dones.copy(), tuple(infos)
+
+    def reset(self) -> VecEnvObs:
+        for remote in self.remotes:
+            remote.send(("reset_shared", None))
+        self._recv_all_none()
+        return self.shared_buffers.read_obs()
+
+    def close(self):
+        if self.closed:
+            return
+        super(SharedMemoryVecEnv, self).close()
+        self.shared_buffers.close(unlink=True)
+
+    def _recv_all_none(self):
+        for remote in self.remotes:
+            remote.recv()
@@ -1,30 +1,40 @@
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.vec_env import SubprocVecEnv
-from stable_baselines3.common.callbacks import CheckpointCallback, CallbackList
+from stable_baselines3.common.callbacks import CallbackList
 
 from robot_sf.robot_env import RobotEnv
 from robot_sf.sim_config import EnvSettings
 from robot_sf.feature_extractor import DynamicsExtractor
 from robot_sf.tb_logging import DrivingMetricsCallback
+from robot_sf.vec_env import SharedMemoryVecEnv
+from robot_sf.precompile import pre_compile
+from robot_sf.checkpoint import AsyncCheckpointCallback
 
 
 def training():
     n_envs = 64
+    envs_per_worker = 4
     ped_densities = [0.01, 0.02, 0.04, 0.08]
     difficulty = 2
 
+    # info: compile the numba kernels once in the main process, the forked
+    #       workers inherit them (and numba's on-disk cache serves other launches)
+    pre_compile()
+
+    # info: the default map pool of EnvSettings is parsed once on import in the main
+    #       process, the forked workers share it by copy-on-write instead of re-parsing it
     def make_env():
         config = EnvSettings()
         config.sim_config.ped_density_by_difficulty = ped_densities
         config.sim_config.difficulty = difficulty
         return RobotEnv(config)
 
-    env = make_vec_env(make_env, n_envs=n_envs, vec_env_cls=SubprocVecEnv)
+    env = make_vec_env(make_env, n_envs=n_envs, vec_env_cls=SharedMemoryVecEnv,
+                       vec_env_kwargs=dict(envs_per_worker=envs_per_worker, start_method="fork"))
 
     policy_kwargs = dict(features_extractor_class=DynamicsExtractor)
     model = PPO("MultiInputPolicy", env, tensorboard_log="./logs/ppo_logs/", policy_kwargs=policy_kwargs)
-    save_model_callback = CheckpointCallback(500_000 // n_envs, "./model/backup", "ppo_model")
+    save_model_callback = AsyncCheckpointCallback(500_000 // n_envs, "./model/backup", "ppo_model")
     collect_metrics_callback = DrivingMetricsCallback(n_envs)
     combined_callback = CallbackList([save_model_callback, collect_metrics_callback])
 
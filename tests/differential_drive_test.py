@@ -1,33 +1,48 @@
 from math import pi
+from typing import Tuple
+
+import pytest
+import numpy as np
+from pytest import approx
 from robot_sf.robot.differential_drive \
     import DifferentialDriveMotion, DifferentialDriveState, DifferentialDriveSettings
 
 
 def norm_angle(angle: float) -> float:
-    while angle < 0:
-        angle += 2*pi
-    while angle >= 2*pi:
-        angle -= 2*pi
-    return angle
+    # info: Python's float modulo wraps into [0, 2*pi) in constant time
+    return angle % (2*pi)
+
+
+@pytest.fixture(scope="module")
+def motion() -> DifferentialDriveMotion:
+    return DifferentialDriveMotion(DifferentialDriveSettings(1, 1, 1, 1))
+
 
+# info: sign of the y coordinate and orientation range of the quadrants the robot drives into
+QUADRANTS = { 1: (1, (0, 0.5*pi)), 4: (-1, (1.5*pi, 2*pi)) }
 
-def test_can_drive_right_curve():
-    motion = DifferentialDriveMotion(DifferentialDriveSettings(1, 1, 1, 1))
+
+@pytest.mark.parametrize("curve_action, quadrant", [
+    ((1, -0.5), 4), # right curve ends in 4th quadrant
+    ((1, 0.5), 1)   # left curve ends in 1st quadrant
+])
+def test_can_drive_curve(motion: DifferentialDriveMotion, curve_action: Tuple[float, float], quadrant: int):
     pose_before, vel_before, wheel_speeds = ((0, 0), 0), (1, 0), (1, 1)
     state = DifferentialDriveState(pose_before, vel_before, wheel_speeds, wheel_speeds)
-    right_curve_action = (1, -0.5)
-    motion.move(state, right_curve_action, 1.0)
+    motion.move(state, curve_action, 1.0)
     pos_after, orient_after = state.pose
-    assert pos_after[0] > 0 and pos_after[1] < 0    # position in 4th quadrant
-    assert 1.5*pi < norm_angle(orient_after) < 2*pi # orientation in 4th quadrant
+    y_sign, (orient_low, orient_high) = QUADRANTS[quadrant]
+    assert pos_after[0] > 0 and pos_after[1] * y_sign > 0      # position in quadrant
+    assert orient_low < norm_angle(orient_after) < orient_high # orientation in quadrant
 
 
-def test_can_drive_left_curve():
-    motion = DifferentialDriveMotion(DifferentialDriveSettings(1, 1, 1, 1))
+def test_batch_motion_matches_single_robot_motion(motion: DifferentialDriveMotion):
     pose_before, vel_before, wheel_speeds = ((0, 0), 0), (1, 0), (1, 1)
-    state = DifferentialDriveState(pose_before, vel_before, wheel_speeds, wheel_speeds)
-    left_curve_action = (1, 0.5)
-    motion.move(state, left_curve_action, 1.0)
-    pos_after, orient_after = state.pose
-    assert pos_after[0] > 0 and pos_after[1] > 0 # position in 1st quadrant
-    assert 0 < norm_angle(orient_after) < 0.5*pi # orientation in 1st quadrant
+    actions = [(1, -0.5), (1, 0.5)]
+    states = np.array([[0, 0, 0, 1, 0, 1, 1], [0, 0, 0, 1, 0, 1, 1]], dtype=np.float64)
+    motion.move_batch(states, np.array(actions), 1.0)
+    for action, batch_state in zip(actions, states):
+        state = DifferentialDriveState(pose_before, vel_before, wheel_speeds, wheel_speeds)
+        motion.move(state, action, 1.0)
+        (pos_x, pos_y), orient = state.pose
+        assert batch_state[:3] == approx([pos_x, pos_y, orient])
@@ -1,14 +1,21 @@
+import pytest
+import numpy as np
 from gym import spaces
 from robot_sf.robot_env import RobotEnv, OBS_DRIVE_STATE, OBS_RAYS
 
 
-def test_can_create_env():
-    env = RobotEnv()
+@pytest.fixture(scope="module")
+def env() -> RobotEnv:
+    # info: creating the env loads the maps and the pedestrian simulation,
+    #       so the tests share one env and reset it instead
+    return RobotEnv()
+
+
+def test_can_create_env(env: RobotEnv):
     assert env is not None
 
 
-def test_can_return_valid_observation():
-    env = RobotEnv()
+def test_can_return_valid_observation(env: RobotEnv):
     drive_state_spec: spaces.Box = env.observation_space[OBS_DRIVE_STATE]
     lidar_state_spec: spaces.Box = env.observation_space[OBS_RAYS]
 
@@ -20,12 +27,13 @@ def test_can_return_valid_observation():
     assert lidar_state_spec.shape == obs[OBS_RAYS].shape
 
 
-def test_can_simulate_with_pedestrians():
+def test_can_simulate_with_pedestrians(env: RobotEnv):
     total_steps = 1000
-    env = RobotEnv()
+    action_space: spaces.Box = env.action_space
+    rand_actions = np.random.uniform(
+        action_space.low, action_space.high, (total_steps, *action_space.shape))
     env.reset()
-    for _ in range(total_steps):
-        rand_action = env.action_space.sample()
+    for rand_action in rand_actions:
         _, _, done, _ = env.step(rand_action)
         if done:
             env.reset()
@@ -0,0 +1,28 @@
+import random
+
+from pytest import approx
+from robot_sf.eval import EnvMetrics, VecEnvMetrics
+
+
+def random_meta() -> dict:
+    flags = ["is_pedestrian_collision", "is_obstacle_collision", "is_robot_at_goal",
+             "is_route_complete", "is_timesteps_exceeded"]
+    return {flag: random.random() < 0.05 for flag in flags}
+
+
+def test_vec_env_metrics_match_the_mean_of_env_metrics():
+    num_envs = 4
+    vec_metrics = VecEnvMetrics(num_envs)
+    env_metrics = [EnvMetrics() for _ in range(num_envs)]
+
+    for _ in range(2000):
+        metas = [random_meta() for _ in range(num_envs)]
+        vec_metrics.update(metas)
+        for metrics, meta in zip(env_metrics, metas):
+            metrics.update(meta)
+
+    rates = ["route_completion_rate", "interm_goal_completion_rate", "timeout_rate",
+             "obstacle_collision_rate", "pedestrian_collision_rate"]
+    for rate in rates:
+        expected_rate = sum([getattr(m, rate) for m in env_metrics]) / num_envs
+        assert getattr(vec_metrics, rate) == approx(expected_rate)
@@ -0,0 +1,45 @@
+import numpy as np
+import torch as th
+from gym import spaces
+
+from robot_sf.robot_env import OBS_DRIVE_STATE, OBS_RAYS
+from robot_sf.feature_extractor import DynamicsExtractor
+
+
+def make_extractor() -> DynamicsExtractor:
+    obs_space = spaces.Dict({
+        OBS_RAYS: spaces.Box(0.0, 10.0, (3, 272), dtype=np.float32),
+        OBS_DRIVE_STATE: spaces.Box(0.0, 1.0, (3, 5), dtype=np.float32)
+    })
+    return DynamicsExtractor(obs_space)
+
+
+def random_obs(batch_size: int) -> dict:
+    return {
+        OBS_RAYS: th.rand((batch_size, 3, 272)) * 10.0,
+        OBS_DRIVE_STATE: th.rand((batch_size, 3, 5))
+    }
+
+
+def test_switch_to_eval_keeps_the_state_dict_keys():
+    extractor = make_extractor()
+    keys_before = list(extractor.state_dict().keys())
+    extractor.switch_to_eval()
+    assert list(extractor.state_dict().keys()) == keys_before
+
+
+def test_quantized_features_match_the_fp32_features():
+    th.manual_seed(42)
+    extractor = make_extractor()
+    extractor.switch_to_eval()
+    obs = random_obs(64)
+    with th.no_grad():
+        fp32_features = extractor(obs)
+
+    extractor.quantize_for_inference(random_obs(256)[OBS_RAYS])
+    with th.no_grad():
+        quant_features = extractor(obs)
+
+    assert quant_features.shape == fp32_features.shape
+    assert np.allclose(quant_features.numpy(), fp32_features.numpy(),
+                       atol=0.05 * float(fp32_features.abs().max()))
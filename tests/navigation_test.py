@@ -1,3 +1,6 @@
+import pytest
+import numpy as np
+
 from robot_sf.nav.navigation import RouteNavigator
 
 
@@ -54,3 +57,20 @@ def test_can_drive_route_from_start_to_finish():
 
     assert navi.reached_destination
     assert reached_waypoint_count == len(route)
+
+
+def test_next_waypoint_orient_follows_the_current_waypoint():
+    route = [(0, 1), (2, 1), (2, 3)]
+    navi = RouteNavigator(route)
+    assert navi.next_waypoint_orient == 0
+    navi.update_position((0.5, 1.5))
+    assert navi.next_waypoint_orient == pytest.approx(np.pi / 2)
+    navi.update_position((2.5, 1.5))
+    assert navi.next_waypoint_orient is None
+
+
+def test_next_waypoint_orient_follows_a_new_route():
+    navi = RouteNavigator([(0, 1), (2, 1)])
+    assert navi.next_waypoint_orient == 0
+    navi.new_route([(0, 1), (0, 3)])
+    assert navi.next_waypoint_orient == pytest.approx(np.pi / 2)
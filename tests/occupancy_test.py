@@ -0,0 +1,36 @@
+import numpy as np
+
+from robot_sf.nav.occupancy import ContinuousOccupancy
+
+
+def occupancy_with(robot_pos, obstacles, ped_pos):
+    return ContinuousOccupancy(
+        10, 10, lambda: robot_pos, lambda: (9, 9),
+        lambda: np.array(obstacles, dtype=np.float64).reshape(-1, 4),
+        lambda: np.array(ped_pos, dtype=np.float64).reshape(-1, 2),
+        robot_radius=1.0, ped_radius=0.4)
+
+
+def test_can_detect_collision_with_obstacle():
+    occ = occupancy_with((5, 5), [[0, 1, 2, 3], [5.5, 4, 5.5, 6]], [])
+    assert occ.is_obstacle_collision
+
+
+def test_no_collision_with_distant_obstacles():
+    occ = occupancy_with((5, 5), [[0, 1, 2, 3], [8, 2, 8, 8]], [])
+    assert not occ.is_obstacle_collision
+
+
+def test_out_of_bounds_counts_as_obstacle_collision():
+    occ = occupancy_with((-1, 5), [], [])
+    assert occ.is_obstacle_collision
+
+
+def test_can_detect_collision_with_pedestrian():
+    occ = occupancy_with((5, 5), [], [[1, 1], [6.2, 5.5]])
+    assert occ.is_pedestrian_collision
+
+
+def test_no_collision_with_distant_pedestrians():
+    occ = occupancy_with((5, 5), [], [[1, 1], [7, 7]])
+    assert not occ.is_pedestrian_collision
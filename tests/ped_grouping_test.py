@@ -81,3 +81,12 @@ def test_can_redirect_group_towards_new_goal():
     new_goal = old_goal[0] + 1, old_goal[1] + 1
     groups.redirect_group(redirected_gid, new_goal)
     assert groups.goal_of_group(redirected_gid) == new_goal
+
+
+def test_groups_as_lists_reflect_membership_changes():
+    groups = init_groups()
+    lists_before = groups.groups_as_lists
+    new_gid = groups.new_group({0, 3})
+    lists_after = groups.groups_as_lists
+    assert lists_before is not lists_after
+    assert sorted(lists_after[new_gid]) == [0, 3]
@@ -0,0 +1,52 @@
+import numpy as np
+from gym import spaces
+
+from robot_sf.sensor.sensor_fusion import \
+    SensorFusion, fused_sensor_space, OBS_DRIVE_STATE, OBS_RAYS
+
+
+def fusion_with_sensor_history(history_steps: int = 3, num_rays: int = 4):
+    robot_obs = spaces.Box(low=np.array([0, -1]), high=np.array([2, 1]), dtype=np.float32)
+    target_obs = spaces.Box(low=np.array([0, -np.pi, -np.pi]),
+                            high=np.array([10, np.pi, np.pi]), dtype=np.float32)
+    lidar_obs = spaces.Box(low=np.zeros((num_rays)), high=np.full((num_rays), 5), dtype=np.float32)
+    _, orig_obs_space = fused_sensor_space(history_steps, robot_obs, target_obs, lidar_obs)
+
+    step = [0]
+    def lidar_sensor():
+        return np.full((num_rays), step[0], dtype=np.float32)
+    def speed_sensor():
+        return (step[0], 0.0)
+    def target_sensor():
+        return (step[0], 0.0, 0.0)
+
+    fusion = SensorFusion(lidar_sensor, speed_sensor, target_sensor, orig_obs_space, True)
+    return fusion, step
+
+
+def test_initial_obs_is_filled_with_first_sensor_state():
+    fusion, step = fusion_with_sensor_history()
+    step[0] = 1
+    obs = fusion.next_obs()
+    assert np.allclose(obs[OBS_RAYS], 1 / 5)
+    assert np.allclose(obs[OBS_DRIVE_STATE][:, 0], 1 / 2)
+
+
+def test_obs_are_stacked_from_oldest_to_newest():
+    fusion, step = fusion_with_sensor_history()
+    for i in range(5):
+        step[0] = i
+        obs = fusion.next_obs()
+    assert np.allclose(obs[OBS_RAYS][:, 0] * 5, [2, 3, 4])
+    assert np.allclose(obs[OBS_DRIVE_STATE][:, 2] * 10, [2, 3, 4])
+
+
+def test_reset_cache_discards_previous_sensor_states():
+    fusion, step = fusion_with_sensor_history()
+    for i in range(3):
+        step[0] = i
+        fusion.next_obs()
+    fusion.reset_cache()
+    step[0] = 4
+    obs = fusion.next_obs()
+    assert np.allclose(obs[OBS_RAYS][:, 0] * 5, [4, 4, 4])
@@ -0,0 +1,46 @@
+import numpy as np
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+from robot_sf.vec_env import BatchedSubprocVecEnv, SharedMemoryVecEnv
+
+
+def test_batched_vec_env_steps_like_dummy_vec_env():
+    n_envs = 5
+    batched_env = make_vec_env("Pendulum-v1", n_envs=n_envs, seed=42, vec_env_cls=BatchedSubprocVecEnv,
+                               vec_env_kwargs=dict(envs_per_worker=2, start_method="spawn"))
+    dummy_env = make_vec_env("Pendulum-v1", n_envs=n_envs, seed=42, vec_env_cls=DummyVecEnv)
+    assert len(batched_env.processes) == 3
+
+    assert np.allclose(batched_env.reset(), dummy_env.reset())
+    for _ in range(10):
+        actions = np.random.uniform(-2, 2, (n_envs, 1)).astype(np.float32)
+        batched_obs, batched_rewards, batched_dones, _ = batched_env.step(actions)
+        dummy_obs, dummy_rewards, dummy_dones, _ = dummy_env.step(actions)
+        assert np.allclose(batched_obs, dummy_obs)
+        assert np.allclose(batched_rewards, dummy_rewards)
+        assert np.array_equal(batched_dones, dummy_dones)
+
+    assert batched_env.get_attr("spec", indices=[4, 0])[0].id == "Pendulum-v1"
+    batched_env.close()
+
+
+def test_shared_memory_vec_env_steps_like_dummy_vec_env():
+    n_envs = 3
+    shared_env = make_vec_env("Pendulum-v1", n_envs=n_envs, seed=42, vec_env_cls=SharedMemoryVecEnv,
+                              vec_env_kwargs=dict(envs_per_worker=2, start_method="spawn"))
+    dummy_env = make_vec_env("Pendulum-v1", n_envs=n_envs, seed=42, vec_env_cls=DummyVecEnv)
+
+    assert np.allclose(shared_env.reset(), dummy_env.reset())
+    last_obs = None
+    for _ in range(10):
+        actions = np.random.uniform(-2, 2, (n_envs, 1)).astype(np.float32)
+        shared_obs, shared_rewards, shared_dones, _ = shared_env.step(actions)
+        dummy_obs, dummy_rewards, dummy_dones, _ = dummy_env.step(actions)
+        assert np.allclose(shared_obs, dummy_obs)
+        assert np.allclose(shared_rewards, dummy_rewards)
+        assert np.array_equal(shared_dones, dummy_dones)
+        assert last_obs is None or not np.shares_memory(last_obs, shared_obs)
+        last_obs = shared_obs
+
+    shared_env.close()